@@ -0,0 +1,102 @@
+"""Contact insert throughput: one insert_one per submission vs the coalescing batch writer.
+
+Needs a MongoDB server. Everything is written to a scratch database that is
+dropped afterwards. Run from the repository root:
+
+    MONGODB_CONNECTION_STRING=mongodb://localhost:27017 python benchmarks/contact_coalescing.py \\
+        [--requests 2000] [--concurrency 200] [--database MECHGENZ_benchmark]
+
+CONTACT_BATCH_WINDOW_MS and CONTACT_BATCH_MAX_DOCS are read from the
+environment as usual, so different settings can be compared.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pymongo
+from bson import ObjectId
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import main  # noqa: E402
+
+def make_submission(index):
+    """A document shaped like the one process_contact_submission inserts"""
+    return {
+        "_id": ObjectId(),
+        "name": f"Customer {index}",
+        "email": f"customer{index}@example.com",
+        "email_normalized": f"customer{index}@example.com",
+        "phone": f"+974 5555 {index:04d}",
+        "phone_digits": f"9745555{index:04d}",
+        "company": "Example Trading W.L.L.",
+        "subject": "Quotation request",
+        "message": "We would like a quotation for the supply and installation of HVAC equipment.",
+        "uploaded_files": [],
+        "submitted_at": datetime.utcnow(),
+        "status": "new"
+    }
+
+async def run_concurrently(submit, requests, concurrency):
+    """Run submit(index) for every request with at most concurrency in flight; returns seconds"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(index):
+        async with semaphore:
+            await submit(index)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(limited(index) for index in range(requests)))
+    return time.perf_counter() - started
+
+async def run_direct(requests, concurrency):
+    """One insert_one per submission on the event loop, as the handler does without coalescing"""
+    async def submit(index):
+        with pymongo.timeout(main.CONTACT_INSERT_TIMEOUT):
+            main.collection.insert_one(make_submission(index))
+    return await run_concurrently(submit, requests, concurrency)
+
+async def run_batched(requests, concurrency):
+    """Submissions queued for the batch writer, which flushes them with insert_many"""
+    async def submit(index):
+        await main.insert_submission_batched(make_submission(index))
+    main.start_contact_batch_writer()
+    try:
+        return await run_concurrently(submit, requests, concurrency)
+    finally:
+        await main.stop_contact_batch_writer()
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000, help="submissions per mode")
+    parser.add_argument("--concurrency", type=int, default=200, help="submissions in flight at once")
+    parser.add_argument("--database", default="MECHGENZ_benchmark", help="scratch database (dropped afterwards)")
+    args = parser.parse_args()
+
+    if not main.MONGODB_CONNECTION_STRING:
+        sys.exit("MONGODB_CONNECTION_STRING is not set")
+    if args.database == main.DATABASE_NAME:
+        sys.exit(f"Refusing to benchmark against the application database {main.DATABASE_NAME}")
+
+    client = pymongo.MongoClient(main.MONGODB_CONNECTION_STRING)
+    try:
+        main.collection = client[args.database][main.COLLECTION_NAME]
+        print(
+            f"{args.requests} submissions, {args.concurrency} in flight, "
+            f"window {main.CONTACT_BATCH_WINDOW_MS}ms, max {main.CONTACT_BATCH_MAX_DOCS} docs per batch"
+        )
+        for label, run in (("insert_one per request", run_direct), ("coalesced insert_many", run_batched)):
+            main.collection.drop()
+            elapsed = asyncio.run(run(args.requests, args.concurrency))
+            stored = main.collection.count_documents({})
+            print(f"  {label:<24} {args.requests / elapsed:8.0f} submissions/s   {elapsed:6.2f} s   {stored} stored")
+        print(f"  batches: {main.contact_batch_stats}")
+    finally:
+        client.drop_database(args.database)
+        client.close()
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,124 @@
+"""Search latency at 100k submissions: keyword, email prefix, phone prefix and deep pages.
+
+Needs a MongoDB server. Submissions are seeded into a scratch database that
+is dropped afterwards. Run from the repository root:
+
+    MONGODB_CONNECTION_STRING=mongodb://localhost:27017 python benchmarks/search.py \\
+        [--documents 100000] [--rounds 50] [--database MECHGENZ_benchmark]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import orjson
+import pymongo
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import main  # noqa: E402
+
+WORDS = (
+    "quotation supply installation hvac chiller maintenance contract tender pump valve "
+    "piping electrical panel generator cooling tower ductwork insulation fabrication "
+    "steel structure warehouse villa tower project urgent site visit drawing boq"
+).split()
+COMPANIES = ["Al Noor Trading", "Gulf Contracting", "Doha Engineering", "Pearl Facilities", "Qatar Steel Works"]
+
+def make_submission(index, rng, now):
+    """A submission with searchable name, email, phone and message"""
+    email = f"customer{index}@{rng.choice(['gmail.com', 'outlook.com', 'example.qa'])}"
+    phone = f"+974 {rng.randint(3000, 7999)} {index % 10000:04d}"
+    return {
+        "name": f"{rng.choice(['Ahmed', 'Fatima', 'John', 'Maria', 'Ravi'])} {rng.choice(COMPANIES)}",
+        "email": email,
+        "email_normalized": main.normalize_email(email),
+        "phone": phone,
+        "phone_digits": main.phone_digits(phone),
+        "company": rng.choice(COMPANIES),
+        "subject": "Inquiry",
+        "message": " ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 40))),
+        "uploaded_files": [],
+        "submitted_at": now - timedelta(minutes=index),
+        "status": rng.choice(["new", "read", "replied", "closed"])
+    }
+
+def seed(documents):
+    """Insert the synthetic submissions in insert_many batches, then build the search indexes"""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    started = time.perf_counter()
+    for start in range(0, documents, 5000):
+        main.collection.insert_many(
+            [make_submission(index, rng, now) for index in range(start, min(start + 5000, documents))],
+            ordered=False
+        )
+    main.initialize_submission_indexes()
+    print(f"Seeded {documents} submissions and built indexes in {time.perf_counter() - started:.1f}s")
+
+async def search(q, cursor=None, status=None):
+    """One page through the search endpoint handler, decoded"""
+    response = await main.search_submissions(q=q, status=status, limit=20, cursor=cursor, mode="auto", include_archived=False)
+    return orjson.loads(response.body)
+
+async def deep_page(q, pages):
+    """Follow next_cursor for several pages"""
+    cursor = None
+    for _ in range(pages):
+        result = await search(q, cursor)
+        cursor = result.get("next_cursor")
+        if not cursor:
+            break
+
+async def measure(label, make_call, rounds):
+    """Print p50/p95 latency of a search call"""
+    await make_call()  # warm up
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await make_call()
+        timings.append((time.perf_counter() - started) * 1000)
+    print(f"  {label:<34} p50 {statistics.median(timings):7.2f} ms   p95 {statistics.quantiles(timings, n=20)[-1]:7.2f} ms")
+
+async def run_queries(rounds):
+    """Time each query shape in turn"""
+    queries = [
+        ("keyword (common): quotation", lambda: search("quotation")),
+        ("keyword (two words): chiller pump", lambda: search("chiller pump")),
+        ("keyword + status: tender", lambda: search("tender", status="new")),
+        ("email prefix: customer123", lambda: search("customer123@")),
+        ("phone prefix: 974 5", lambda: search("974 5")),
+        ("keyword, 10 pages deep", lambda: deep_page("installation", 10))
+    ]
+    print(f"{rounds} rounds per query")
+    for label, make_call in queries:
+        await measure(label, make_call, rounds)
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=100000, help="submissions to seed")
+    parser.add_argument("--rounds", type=int, default=50, help="timed runs per query")
+    parser.add_argument("--database", default="MECHGENZ_benchmark", help="scratch database (dropped afterwards)")
+    args = parser.parse_args()
+
+    if not main.MONGODB_CONNECTION_STRING:
+        sys.exit("MONGODB_CONNECTION_STRING is not set")
+    if args.database == main.DATABASE_NAME:
+        sys.exit(f"Refusing to benchmark against the application database {main.DATABASE_NAME}")
+
+    client = pymongo.MongoClient(main.MONGODB_CONNECTION_STRING)
+    try:
+        client.drop_database(args.database)
+        main.collection = client[args.database][main.COLLECTION_NAME]
+        main.is_db_connected = True
+        seed(args.documents)
+        asyncio.run(run_queries(args.rounds))
+    finally:
+        client.drop_database(args.database)
+        client.close()
+
+if __name__ == "__main__":
+    main_cli()
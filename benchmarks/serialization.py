@@ -0,0 +1,103 @@
+"""Serialize a page of submissions: MongoJSONResponse vs the old convert-then-jsonable_encoder path.
+
+Needs no database. Run from the repository root:
+
+    python benchmarks/serialization.py [--count 500] [--rounds 200]
+"""
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import main  # noqa: E402
+
+def make_submissions(count):
+    """Submissions shaped like contact_submissions documents, half of them with attachments"""
+    now = datetime.utcnow()
+    submissions = []
+    for index in range(count):
+        submitted_at = now - timedelta(minutes=index)
+        submissions.append({
+            "_id": ObjectId(),
+            "name": f"Customer {index}",
+            "email": f"customer{index}@example.com",
+            "phone": f"+974 5555 {index:04d}",
+            "company": "Example Trading W.L.L.",
+            "subject": "Quotation request",
+            "message": "We would like a quotation for the supply and installation of HVAC equipment. " * 3,
+            "uploaded_files": [
+                {
+                    "original_name": "drawing.pdf",
+                    "saved_name": f"{index}_drawing.pdf",
+                    "sha256": "ab" * 32,
+                    "file_size": 482133,
+                    "content_type": "application/pdf",
+                    "uploaded_at": submitted_at
+                }
+            ] if index % 2 else [],
+            "submitted_at": submitted_at,
+            "updated_at": submitted_at,
+            "status": "new"
+        })
+    return submissions
+
+def legacy_render(submissions):
+    """What list handlers did before: convert ids and datetimes by hand, then jsonable_encoder"""
+    converted = []
+    for document in submissions:
+        document = dict(document)
+        document["_id"] = str(document["_id"])
+        for field in ("submitted_at", "updated_at"):
+            if document.get(field):
+                document[field] = document[field].isoformat()
+        document["uploaded_files"] = [
+            {**file_info, "uploaded_at": file_info["uploaded_at"].isoformat()}
+            for file_info in document["uploaded_files"]
+        ]
+        converted.append(document)
+    content = {"success": True, "submissions": converted, "returned_count": len(converted)}
+    return JSONResponse(jsonable_encoder(content)).body
+
+def mongo_render(submissions):
+    """Current path: raw documents straight into MongoJSONResponse"""
+    content = {"success": True, "submissions": submissions, "returned_count": len(submissions)}
+    return main.MongoJSONResponse(content).body
+
+def measure(render, submissions, rounds):
+    """Milliseconds per page for each round"""
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        render(submissions)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=500, help="submissions per page")
+    parser.add_argument("--rounds", type=int, default=200, help="pages serialized per encoder")
+    args = parser.parse_args()
+
+    submissions = make_submissions(args.count)
+    print(f"Page of {args.count} submissions, {args.rounds} rounds")
+    results = {}
+    for label, render in (("legacy jsonable_encoder", legacy_render), ("MongoJSONResponse", mongo_render)):
+        render(submissions)  # warm up
+        timings = measure(render, submissions, args.rounds)
+        results[label] = statistics.median(timings)
+        print(
+            f"  {label:<24} median {results[label]:7.2f} ms   "
+            f"p95 {statistics.quantiles(timings, n=20)[-1]:7.2f} ms   "
+            f"{len(render(submissions)) / 1024:6.0f} KiB"
+        )
+    print(f"  speedup {results['legacy jsonable_encoder'] / results['MongoJSONResponse']:.1f}x")
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,15 +1,21 @@
-from fastapi import FastAPI, HTTPException, Request, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, Request, UploadFile, File, Form, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import Response, JSONResponse, FileResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure, PyMongoError
-from datetime import datetime
+from starlette.datastructures import Headers, MutableHeaders
+from pymongo import MongoClient, monitoring
+from pymongo.errors import ConnectionFailure, PyMongoError, BulkWriteError, DuplicateKeyError, OperationFailure
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional, List
-from contextlib import asynccontextmanager
-from bson import ObjectId
+from contextlib import asynccontextmanager, contextmanager, closing
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from bson import ObjectId, Decimal128, json_util
+from decimal import Decimal
 from pathlib import Path
+from urllib.parse import quote
 import os
+import errno
 from dotenv import load_dotenv
 import logging
 import resend
@@ -18,6 +24,17 @@ import uuid
 import hashlib
 import shutil
 import base64
+import html
+import re
+import io
+import zipfile
+import orjson
+import asyncio
+import time
+import random
+import threading
+import requests
+import pymongo
 
 # Load environment variables
 load_dotenv()
@@ -33,6 +50,86 @@ DATABASE_NAME = "MECHGENZ"
 COLLECTION_NAME = "contact_submissions"
 GALLERY_COLLECTION_NAME = "website_images"
 ADMIN_COLLECTION_NAME = "admin_users"
+IDEMPOTENCY_COLLECTION_NAME = "idempotency_keys"
+APP_METADATA_COLLECTION_NAME = "app_metadata"
+ATTACHMENT_BLOB_COLLECTION_NAME = "attachment_blobs"
+UPLOAD_SESSION_COLLECTION_NAME = "upload_sessions"
+ARCHIVE_COLLECTION_NAME = "contact_submissions_archive"
+SUBMISSION_ROLLUP_COLLECTION_NAME = "submission_daily_stats"
+GALLERY_TOMBSTONE_COLLECTION_NAME = "website_image_tombstones"
+
+# Admission control for upload routes: per-route concurrency and a per-worker in-flight body budget
+ADMISSION_MAX_INFLIGHT_BYTES = int(os.getenv("ADMISSION_MAX_INFLIGHT_BYTES", str(100 * 1024 * 1024)))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "16"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2"))
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "5"))
+ADMISSION_ROUTES = [
+    ("contact", "POST", re.compile(r"^/api/contact$"), int(os.getenv("ADMISSION_CONTACT_CONCURRENCY", "8"))),
+    ("image_upload", "POST", re.compile(r"^/api/website-images/[^/]+/upload$"), int(os.getenv("ADMISSION_IMAGE_UPLOAD_CONCURRENCY", "4"))),
+    ("upload_chunk", "PUT", re.compile(r"^/api/uploads/[^/]+$"), int(os.getenv("ADMISSION_UPLOAD_CHUNK_CONCURRENCY", "8")))
+]
+
+# Realtime submission events (Server-Sent Events fed by a change stream or in-process pub/sub)
+SUBMISSION_CHANGE_STREAM_ENABLED = os.getenv("SUBMISSION_CHANGE_STREAM_ENABLED", "true").lower() in ("1", "true", "yes")
+SSE_HEARTBEAT_INTERVAL = float(os.getenv("SSE_HEARTBEAT_INTERVAL", "15"))
+SSE_SUBSCRIBER_QUEUE_SIZE = int(os.getenv("SSE_SUBSCRIBER_QUEUE_SIZE", "100"))
+
+# Submission search: text index weights and result limits
+SEARCH_TEXT_WEIGHTS = {"name": 10, "email": 8, "phone": 5, "message": 1}
+SEARCH_MAX_LIMIT = int(os.getenv("SEARCH_MAX_LIMIT", "100"))
+SEARCH_SNIPPET_RADIUS = 60
+
+# Field selection for submission listings (fields=summary | full | comma-separated names)
+MESSAGE_PREVIEW_LENGTH = int(os.getenv("MESSAGE_PREVIEW_LENGTH", "160"))
+
+# Total counts for submission listings (count=exact | cached | estimated | none)
+SUBMISSION_COUNT_CACHE_TTL = float(os.getenv("SUBMISSION_COUNT_CACHE_TTL", "30"))
+
+# Bulk submission operations
+BULK_MAX_SUBMISSIONS = int(os.getenv("BULK_MAX_SUBMISSIONS", "1000"))
+BULK_FILE_WORKERS = int(os.getenv("BULK_FILE_WORKERS", "8"))
+BATCH_FETCH_MAX_IDS = int(os.getenv("BATCH_FETCH_MAX_IDS", "200"))
+
+# Archival of old or closed submissions into ARCHIVE_COLLECTION_NAME
+ARCHIVE_ENABLED = os.getenv("ARCHIVE_ENABLED", "false").lower() in ("1", "true", "yes")
+ARCHIVE_INTERVAL = float(os.getenv("ARCHIVE_INTERVAL", str(24 * 60 * 60)))
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "365"))
+ARCHIVE_TERMINAL_STATUSES = [status.strip() for status in os.getenv("ARCHIVE_TERMINAL_STATUSES", "closed,spam").split(",") if status.strip()]
+ARCHIVE_TERMINAL_AFTER_DAYS = int(os.getenv("ARCHIVE_TERMINAL_AFTER_DAYS", "30"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+
+# Submission time-series from the daily rollup
+STATS_TIMESERIES_MAX_DAYS = int(os.getenv("STATS_TIMESERIES_MAX_DAYS", "1830"))
+# Valid status names; anchored because $regexMatch in the rollup rebuild searches substrings
+STATUS_NAME_PATTERN = r"^[^.$]{1,64}$"
+
+# Admin dashboard payload cache (cleared on submission, gallery and profile writes)
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "10"))
+DASHBOARD_RECENT_SUBMISSIONS = int(os.getenv("DASHBOARD_RECENT_SUBMISSIONS", "10"))
+
+# Gallery writes still in flight after this many seconds are treated as abandoned by delta sync
+GALLERY_WRITE_TIMEOUT = float(os.getenv("GALLERY_WRITE_TIMEOUT", "30"))
+
+# Idempotency-Key support for POST /api/contact and POST /api/send-reply
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", str(24 * 60 * 60)))
+IDEMPOTENCY_LOCK_TIMEOUT = float(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT", "120"))
+IDEMPOTENCY_WAIT_TIMEOUT = float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", "30"))
+IDEMPOTENCY_LOCAL_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_LOCAL_CACHE_SIZE", "10000"))
+
+# MongoClient pool and timeout tuning (unset values keep the PyMongo defaults)
+MONGODB_CLIENT_OPTIONS_ENV = {
+    "maxPoolSize": "MONGODB_MAX_POOL_SIZE",
+    "minPoolSize": "MONGODB_MIN_POOL_SIZE",
+    "maxIdleTimeMS": "MONGODB_MAX_IDLE_TIME_MS",
+    "maxConnecting": "MONGODB_MAX_CONNECTING",
+    "waitQueueTimeoutMS": "MONGODB_WAIT_QUEUE_TIMEOUT_MS",
+    "connectTimeoutMS": "MONGODB_CONNECT_TIMEOUT_MS",
+    "socketTimeoutMS": "MONGODB_SOCKET_TIMEOUT_MS",
+    "serverSelectionTimeoutMS": "MONGODB_SERVER_SELECTION_TIMEOUT_MS",
+}
+MONGODB_SUPERVISOR_INTERVAL = float(os.getenv("MONGODB_SUPERVISOR_INTERVAL", "10"))
+MONGODB_RECONNECT_MIN_DELAY = float(os.getenv("MONGODB_RECONNECT_MIN_DELAY", "1"))
+MONGODB_RECONNECT_MAX_DELAY = float(os.getenv("MONGODB_RECONNECT_MAX_DELAY", "60"))
 
 # Resend configuration
 RESEND_API_KEY = os.getenv("RESEND_API_KEY", "re_G4hUh9oq_Dcaj4qoYtfWWv5saNvgG7ZEW")
@@ -53,6 +150,73 @@ IMAGES_DIR = Path("images")
 IMAGES_DIR.mkdir(exist_ok=True)
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".pdf", ".doc", ".docx", ".txt"}
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Resumable chunked uploads for gallery images and submission attachments
+RESUMABLE_UPLOAD_MAX_SIZE = int(os.getenv("RESUMABLE_UPLOAD_MAX_SIZE", str(100 * 1024 * 1024)))
+UPLOAD_SESSION_TTL = int(os.getenv("UPLOAD_SESSION_TTL", str(24 * 60 * 60)))
+UPLOAD_SESSION_LEASE_SECONDS = int(os.getenv("UPLOAD_SESSION_LEASE_SECONDS", "120"))
+
+# How long an upload waits for a concurrent deletion of the same attachment blob
+ATTACHMENT_BLOB_RELEASE_TIMEOUT = float(os.getenv("ATTACHMENT_BLOB_RELEASE_TIMEOUT", "30"))
+GALLERY_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+
+# ZIP export of submission attachments; these formats are already compressed and stored as-is
+ZIP_STORED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".pdf", ".docx", ".zip"}
+ZIP_EXPORT_MAX_SUBMISSIONS = int(os.getenv("ZIP_EXPORT_MAX_SUBMISSIONS", "500"))
+
+# Per-worker LRU of (submission id, saved name) -> attachment metadata for downloads
+ATTACHMENT_MANIFEST_CACHE_SIZE = int(os.getenv("ATTACHMENT_MANIFEST_CACHE_SIZE", "2048"))
+ATTACHMENT_MANIFEST_CACHE_TTL = float(os.getenv("ATTACHMENT_MANIFEST_CACHE_TTL", "300"))
+
+# Content-addressed attachment store: uploads/blobs/<aa>/<bb>/<sha256>
+ATTACHMENT_BLOB_DIR = UPLOAD_DIR / "blobs"
+ATTACHMENT_BLOB_DIR.mkdir(exist_ok=True)
+UPLOAD_TMP_DIR = UPLOAD_DIR / "tmp"
+UPLOAD_TMP_DIR.mkdir(exist_ok=True)
+
+# Orphan file garbage collection for images/ and uploads/
+QUARANTINE_DIR = Path(os.getenv("QUARANTINE_DIR", "quarantine"))
+QUARANTINE_DIR.mkdir(exist_ok=True)
+ORPHAN_GC_ENABLED = os.getenv("ORPHAN_GC_ENABLED", "false").lower() in ("1", "true", "yes")
+ORPHAN_GC_INTERVAL = float(os.getenv("ORPHAN_GC_INTERVAL", "3600"))
+ORPHAN_GC_GRACE_PERIOD = float(os.getenv("ORPHAN_GC_GRACE_PERIOD", str(24 * 60 * 60)))
+ORPHAN_QUARANTINE_RETENTION = float(os.getenv("ORPHAN_QUARANTINE_RETENTION", str(7 * 24 * 60 * 60)))
+ORPHAN_GC_MAX_FILES_PER_SWEEP = int(os.getenv("ORPHAN_GC_MAX_FILES_PER_SWEEP", "500"))
+ORPHAN_GC_FILES_PER_SECOND = float(os.getenv("ORPHAN_GC_FILES_PER_SECOND", "50"))
+
+# File storage backend: "local" (this node's disk) or "s3" (any S3-compatible store, e.g. MinIO)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local").lower()
+S3_BUCKET = os.getenv("S3_BUCKET")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
+S3_REGION = os.getenv("S3_REGION")
+S3_ACCESS_KEY_ID = os.getenv("S3_ACCESS_KEY_ID")
+S3_SECRET_ACCESS_KEY = os.getenv("S3_SECRET_ACCESS_KEY")
+S3_PRESIGN_EXPIRES = int(os.getenv("S3_PRESIGN_EXPIRES", "300"))
+S3_MULTIPART_THRESHOLD = int(os.getenv("S3_MULTIPART_THRESHOLD", str(8 * 1024 * 1024)))
+S3_MULTIPART_CHUNKSIZE = int(os.getenv("S3_MULTIPART_CHUNKSIZE", str(8 * 1024 * 1024)))
+S3_MAX_CONCURRENCY = int(os.getenv("S3_MAX_CONCURRENCY", "4"))
+
+# Write-ahead spool for contact submissions accepted while MongoDB is unavailable
+SPOOL_DIR = Path(os.getenv("SPOOL_DIR", "spool"))
+SPOOL_DIR.mkdir(exist_ok=True)
+CONTACT_SPOOL_FILE = SPOOL_DIR / "contact_submissions.jsonl"
+CONTACT_SPOOL_REPLAY_FILE = SPOOL_DIR / "contact_submissions.replaying.jsonl"
+CONTACT_INSERT_TIMEOUT = float(os.getenv("CONTACT_INSERT_TIMEOUT", "5"))
+SPOOL_REPLAY_INTERVAL = float(os.getenv("SPOOL_REPLAY_INTERVAL", "5"))
+SPOOL_REPLAY_BATCH_SIZE = int(os.getenv("SPOOL_REPLAY_BATCH_SIZE", "100"))
+
+# Optional micro-batching of contact submission inserts under burst load
+CONTACT_BATCH_WRITES = os.getenv("CONTACT_BATCH_WRITES", "false").lower() in ("1", "true", "yes")
+CONTACT_BATCH_WINDOW_MS = float(os.getenv("CONTACT_BATCH_WINDOW_MS", "5"))
+CONTACT_BATCH_MAX_DOCS = int(os.getenv("CONTACT_BATCH_MAX_DOCS", "50"))
+
+# Health probe configuration (background prober feeding /readyz)
+HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "10"))
+HEALTH_CACHE_TTL = float(os.getenv("HEALTH_CACHE_TTL", "30"))
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "3"))
+MIN_FREE_DISK_BYTES = int(os.getenv("MIN_FREE_DISK_MB", "100")) * 1024 * 1024
+RESEND_HEALTH_URL = os.getenv("RESEND_HEALTH_URL", "https://api.resend.com")
 
 # Global MongoDB client
 mongodb_client = None
@@ -60,8 +224,151 @@ database = None
 collection = None
 gallery_collection = None
 admin_collection = None
+idempotency_collection = None
+attachment_blob_collection = None
+app_metadata_collection = None
+upload_session_collection = None
+archive_collection = None
+submission_rollup_collection = None
+gallery_tombstone_collection = None
 is_db_connected = False
 
+# Connection supervisor state (guarded by db_state_lock)
+db_state_lock = threading.Lock()
+db_connection_state = {
+    "state": "disconnected",
+    "since": None,
+    "last_error": None,
+    "consecutive_failures": 0,
+    "reconnects": 0
+}
+mongodb_supervisor_task = None
+
+# Spool file appends and rotation are serialized across threads
+spool_lock = threading.Lock()
+spool_replay_task = None
+
+# Micro-batching writer state (created at startup when CONTACT_BATCH_WRITES is on)
+contact_batch_queue = None
+contact_batch_task = None
+contact_batch_stats = {"batches": 0, "documents": 0, "largest_batch": 0}
+
+# Idempotency state: in-flight (fingerprint, future) pairs and recently completed responses for this worker
+idempotency_inflight = {}
+idempotency_local_results = OrderedDict()
+
+# Admission control state for this worker (metrics served by /api/debug/admission)
+admission_semaphores = {name: asyncio.Semaphore(limit) for name, _, _, limit in ADMISSION_ROUTES}
+admission_stats = {
+    "inflight_bytes": 0,
+    "max_inflight_bytes": ADMISSION_MAX_INFLIGHT_BYTES,
+    "rejected_over_budget": 0,
+    "routes": {
+        name: {"limit": limit, "active": 0, "waiting": 0, "max_waiting": 0, "admitted": 0, "rejected": 0}
+        for name, _, _, limit in ADMISSION_ROUTES
+    }
+}
+
+# Realtime submission event fan-out for this worker
+submission_event_subscribers = set()
+submission_events_loop = None
+submission_events_source = "local"
+submission_change_stream_task = None
+submission_change_stream_stop = threading.Event()
+submission_change_stream_resume_token = None
+
+# Cached submission counts per filter: {filter key: (expires_at monotonic, count)}
+submission_count_cache = {}
+
+# Admin dashboard payloads: limit -> (expires_at, payload)
+dashboard_cache = {}
+dashboard_cache_generation = 0
+
+# Archival job state
+archive_task = None
+archive_lock = threading.Lock()
+
+# Download fast path: cached attachment metadata for this worker
+attachment_manifest_cache = OrderedDict()
+
+# Orphan garbage collector state
+orphan_gc_task = None
+orphan_gc_lock = threading.Lock()
+orphan_gc_last_report = None
+
+# Cached results of the background health prober
+health_cache = {"checked_at": None, "monotonic": None, "checks": {}}
+health_probe_task = None
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Collect MongoDB connection pool statistics from PyMongo CMAP events"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stats = {
+            "connections_open": 0,
+            "connections_in_use": 0,
+            "checkouts_waiting": 0,
+            "connections_created": 0,
+            "connections_closed": 0,
+            "checkouts_total": 0,
+            "checkout_failures": 0,
+            "pools_cleared": 0
+        }
+
+    def _update(self, **changes):
+        with self.lock:
+            for key, amount in changes.items():
+                self.stats[key] += amount
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._update(pools_cleared=1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._update(connections_created=1, connections_open=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._update(connections_closed=1, connections_open=-1)
+
+    def connection_check_out_started(self, event):
+        self._update(checkouts_waiting=1)
+
+    def connection_check_out_failed(self, event):
+        self._update(checkouts_waiting=-1, checkout_failures=1)
+
+    def connection_checked_out(self, event):
+        self._update(checkouts_waiting=-1, connections_in_use=1, checkouts_total=1)
+
+    def connection_checked_in(self, event):
+        self._update(connections_in_use=-1)
+
+pool_stats_listener = PoolStatsListener()
+
+def mongodb_client_options():
+    """Build MongoClient keyword arguments from environment variables"""
+    options = {}
+    for option, env_name in MONGODB_CLIENT_OPTIONS_ENV.items():
+        value = os.getenv(env_name)
+        if value:
+            options[option] = int(value)
+    return options
+
 def hash_password(password: str) -> str:
     """Hash a password using SHA-256"""
     return hashlib.sha256(password.encode()).hexdigest()
@@ -238,6 +545,19 @@ def initialize_gallery_data():
         logger.error(f"❌ Error initializing gallery data: {e}")
         return False
 
+def initialize_gallery_sync():
+    """Create the indexes behind GET /api/website-images/changes"""
+    try:
+        if gallery_collection is None or gallery_tombstone_collection is None:
+            return False
+        gallery_collection.create_index("version")
+        gallery_tombstone_collection.create_index("version")
+        gallery_tombstone_collection.create_index("deleted_at")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Error creating gallery sync indexes: {e}")
+        return False
+
 def initialize_default_admin():
     """Initialize default admin if none exists"""
     global admin_collection
@@ -288,55 +608,261 @@ def initialize_default_admin():
         logger.error(f"❌ Error creating default admin: {e}")
         return False
 
+def set_db_connection_state(state, error=None):
+    """Record a connection state transition (caller must hold db_state_lock)"""
+    if db_connection_state["state"] != state:
+        db_connection_state["since"] = datetime.utcnow()
+    db_connection_state["state"] = state
+    if error is not None:
+        db_connection_state["last_error"] = str(error)
+        db_connection_state["consecutive_failures"] += 1
+    elif state == "connected":
+        db_connection_state["consecutive_failures"] = 0
+
+def mark_db_disconnected(error):
+    """Flip readiness off after a failed health check, keeping the client for reconnection"""
+    global is_db_connected
+    with db_state_lock:
+        was_connected = is_db_connected
+        is_db_connected = False
+        set_db_connection_state("disconnected", error)
+    if was_connected:
+        logger.error(f"❌ Lost MongoDB connection: {error}")
+
+def initialize_idempotency_store():
+    """Create the idempotency key indexes (TTL expiry on created_at)"""
+    try:
+        if idempotency_collection is None:
+            return False
+        idempotency_collection.create_index("created_at", expireAfterSeconds=IDEMPOTENCY_KEY_TTL)
+        return True
+    except Exception as e:
+        logger.error(f"❌ Error creating idempotency key indexes: {e}")
+        return False
+
+def initialize_submission_indexes():
+    """Create indexes used by contact submission queries"""
+    try:
+        if collection is None:
+            return False
+        collection.create_index("uploaded_files.sha256", sparse=True)
+        collection.create_index(
+            [(field, "text") for field in SEARCH_TEXT_WEIGHTS],
+            weights=SEARCH_TEXT_WEIGHTS,
+            name="submission_text_search"
+        )
+        collection.create_index("email_normalized")
+        collection.create_index("phone_digits")
+        backfill_submission_search_fields()
+        return True
+    except Exception as e:
+        logger.error(f"❌ Error creating submission indexes: {e}")
+        return False
+
+def initialize_archive_indexes():
+    """Create the archive collection indexes used by include_archived queries"""
+    try:
+        if archive_collection is None:
+            return False
+        archive_collection.create_index([("submitted_at", -1)])
+        archive_collection.create_index("status")
+        archive_collection.create_index("uploaded_files.sha256", sparse=True)
+        archive_collection.create_index(
+            [(field, "text") for field in SEARCH_TEXT_WEIGHTS],
+            weights=SEARCH_TEXT_WEIGHTS,
+            name="submission_text_search"
+        )
+        archive_collection.create_index("email_normalized")
+        archive_collection.create_index("phone_digits")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Error creating archive indexes: {e}")
+        return False
+
+def initialize_submission_rollup():
+    """Rebuild the daily stats rollup from history when it is empty"""
+    try:
+        if submission_rollup_collection is None:
+            return False
+        if submission_rollup_collection.estimated_document_count() == 0 and collection.estimated_document_count() > 0:
+            rebuild_submission_rollup()
+        return True
+    except Exception as e:
+        logger.error(f"❌ Error initializing submission rollup: {e}")
+        return False
+
+def initialize_upload_sessions():
+    """Create the resumable upload session indexes (TTL expiry on expires_at)"""
+    try:
+        if upload_session_collection is None:
+            return False
+        upload_session_collection.create_index("expires_at", expireAfterSeconds=0)
+        return True
+    except Exception as e:
+        logger.error(f"❌ Error creating upload session indexes: {e}")
+        return False
+
+def backfill_submission_search_fields():
+    """Fill email_normalized and phone_digits on submissions stored before search existed.
+
+    Runs as one server-side pipeline update, so no documents are shipped to the app.
+    """
+    result = collection.update_many(
+        {"email_normalized": {"$exists": False}},
+        [{"$set": {
+            "email_normalized": {"$toLower": {"$trim": {"input": {"$ifNull": ["$email", ""]}}}},
+            "phone_digits": {"$reduce": {
+                "input": {"$regexFindAll": {"input": {"$ifNull": ["$phone", ""]}, "regex": "[0-9]"}},
+                "initialValue": "",
+                "in": {"$concat": ["$$value", "$$this.match"]}
+            }}
+        }}]
+    )
+    if result.modified_count:
+        logger.info(f"🔎 Backfilled search fields on {result.modified_count} submissions")
+    return result.modified_count
+
 def connect_to_mongodb():
-    """Initialize MongoDB connection"""
-    global mongodb_client, database, collection, gallery_collection, admin_collection, is_db_connected
+    """Initialize MongoDB connection (safe to call repeatedly from the supervisor)"""
+    global mongodb_client, database, collection, gallery_collection, admin_collection, idempotency_collection, attachment_blob_collection, app_metadata_collection, upload_session_collection, archive_collection, submission_rollup_collection, gallery_tombstone_collection, is_db_connected
     
+    client = None
     try:
         if not MONGODB_CONNECTION_STRING:
             logger.error("MongoDB connection string not found in environment variables")
             logger.info("Please create a .env file in the backend directory with MONGODB_CONNECTION_STRING")
             return False
         
-        logger.info("Attempting to connect to MongoDB...")
-        mongodb_client = MongoClient(MONGODB_CONNECTION_STRING)
+        with db_state_lock:
+            set_db_connection_state("connecting")
+        
+        # Reuse the existing client - PyMongo re-establishes its own connections
+        client = mongodb_client
+        if client is None:
+            logger.info("Attempting to connect to MongoDB...")
+            client = MongoClient(
+                MONGODB_CONNECTION_STRING,
+                event_listeners=[pool_stats_listener],
+                **mongodb_client_options()
+            )
         
         # Test the connection
-        mongodb_client.admin.command('ping')
+        client.admin.command('ping')
         logger.info("Successfully connected to MongoDB Atlas")
         
-        # Get database and collections
-        database = mongodb_client[DATABASE_NAME]
-        collection = database[COLLECTION_NAME]
-        gallery_collection = database[GALLERY_COLLECTION_NAME]
-        admin_collection = database[ADMIN_COLLECTION_NAME]
-        is_db_connected = True
+        # Publish the client, collections and readiness flag together
+        with db_state_lock:
+            was_reconnect = db_connection_state["consecutive_failures"] > 0
+            mongodb_client = client
+            database = client[DATABASE_NAME]
+            collection = database[COLLECTION_NAME]
+            gallery_collection = database[GALLERY_COLLECTION_NAME]
+            admin_collection = database[ADMIN_COLLECTION_NAME]
+            idempotency_collection = database[IDEMPOTENCY_COLLECTION_NAME]
+            attachment_blob_collection = database[ATTACHMENT_BLOB_COLLECTION_NAME]
+            app_metadata_collection = database[APP_METADATA_COLLECTION_NAME]
+            upload_session_collection = database[UPLOAD_SESSION_COLLECTION_NAME]
+            archive_collection = database[ARCHIVE_COLLECTION_NAME]
+            submission_rollup_collection = database[SUBMISSION_ROLLUP_COLLECTION_NAME]
+            gallery_tombstone_collection = database[GALLERY_TOMBSTONE_COLLECTION_NAME]
+            is_db_connected = True
+            if was_reconnect:
+                db_connection_state["reconnects"] += 1
+            set_db_connection_state("connected")
         
         logger.info(f"Database: {DATABASE_NAME}, Collections: {COLLECTION_NAME}, {GALLERY_COLLECTION_NAME}, {ADMIN_COLLECTION_NAME}")
         
         # Initialize gallery data if empty
         initialize_gallery_data()
         
+        # Index slot versions and tombstones for delta sync
+        initialize_gallery_sync()
+        
         # Initialize default admin if none exists
         initialize_default_admin()
         
+        # Ensure idempotency keys expire
+        initialize_idempotency_store()
+        
+        # Index attachment references for blob garbage collection
+        initialize_submission_indexes()
+        
+        # Expire abandoned resumable uploads
+        initialize_upload_sessions()
+        
+        # Index the archive tier for listing, search and blob references
+        initialize_archive_indexes()
+        
+        # Build the per-day stats rollup on first start
+        initialize_submission_rollup()
+        
         return True
         
     except ConnectionFailure as e:
         logger.error(f"Failed to connect to MongoDB: {e}")
-        is_db_connected = False
+        if client is not None and mongodb_client is None:
+            mongodb_client = client
+        mark_db_disconnected(e)
         return False
     except Exception as e:
         logger.error(f"Error connecting to MongoDB: {e}")
-        is_db_connected = False
+        if client is not None and client is not mongodb_client:
+            client.close()
+        mark_db_disconnected(e)
         return False
 
+async def mongodb_supervisor_loop():
+    """Keep the MongoDB connection healthy, reconnecting with exponential backoff"""
+    delay = MONGODB_RECONNECT_MIN_DELAY
+    while True:
+        try:
+            if is_db_connected:
+                try:
+                    await asyncio.to_thread(mongodb_client.admin.command, 'ping')
+                    delay = MONGODB_RECONNECT_MIN_DELAY
+                    await asyncio.sleep(MONGODB_SUPERVISOR_INTERVAL)
+                    continue
+                except Exception as e:
+                    mark_db_disconnected(e)
+            
+            with db_state_lock:
+                set_db_connection_state("reconnecting")
+            logger.info(f"🔄 Reconnecting to MongoDB (attempt {db_connection_state['consecutive_failures'] + 1})...")
+            if await asyncio.to_thread(connect_to_mongodb):
+                logger.info("✅ MongoDB connection restored")
+                delay = MONGODB_RECONNECT_MIN_DELAY
+                continue
+            
+            # Full jitter keeps many workers from reconnecting in lockstep
+            await asyncio.sleep(random.uniform(MONGODB_RECONNECT_MIN_DELAY, delay))
+            delay = min(delay * 2, MONGODB_RECONNECT_MAX_DELAY)
+            
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"MongoDB supervisor error: {e}")
+            await asyncio.sleep(delay)
+
+def get_db_connection_status():
+    """Snapshot of the connection state and pool statistics"""
+    with db_state_lock:
+        state = dict(db_connection_state)
+        connected = is_db_connected
+    return {
+        "connected": connected,
+        **state,
+        "client_options": mongodb_client_options(),
+        "pool": pool_stats_listener.snapshot()
+    }
+
 def close_mongodb_connection():
     """Close MongoDB connection"""
     global mongodb_client, is_db_connected
     if mongodb_client:
         mongodb_client.close()
-        is_db_connected = False
+        with db_state_lock:
+            is_db_connected = False
+            set_db_connection_state("closed")
         logger.info("MongoDB connection closed")
 
 def format_file_size(bytes_size):
@@ -347,6 +873,327 @@ def format_file_size(bytes_size):
         bytes_size /= 1024.0
     return f"{bytes_size:.1f} TB"
 
+def probe_mongodb():
+    """Ping MongoDB and report latency"""
+    if mongodb_client is None or not is_db_connected:
+        return {"status": "disconnected"}
+    started = time.perf_counter()
+    try:
+        mongodb_client.admin.command('ping')
+        return {"status": "ok", "latency_ms": round((time.perf_counter() - started) * 1000, 1)}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+def probe_resend():
+    """Check that the Resend API host is reachable (any HTTP response counts)"""
+    started = time.perf_counter()
+    try:
+        response = requests.head(RESEND_HEALTH_URL, timeout=HEALTH_PROBE_TIMEOUT)
+        return {
+            "status": "ok",
+            "http_status": response.status_code,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+def probe_disk():
+    """Check free disk space for the uploads and images directories"""
+    directories = {}
+    status = "ok"
+    for directory in (UPLOAD_DIR, IMAGES_DIR):
+        try:
+            usage = shutil.disk_usage(directory)
+            directory_ok = usage.free >= MIN_FREE_DISK_BYTES
+            directories[str(directory)] = {
+                "free_bytes": usage.free,
+                "free": format_file_size(usage.free),
+                "ok": directory_ok
+            }
+            if not directory_ok:
+                status = "error"
+        except Exception as e:
+            directories[str(directory)] = {"ok": False, "error": str(e)}
+            status = "error"
+    return {"status": status, "directories": directories}
+
+async def run_health_probes():
+    """Run all health probes concurrently and replace the cached results"""
+    global health_cache
+    mongodb_result, resend_result, disk_result = await asyncio.gather(
+        asyncio.to_thread(probe_mongodb),
+        asyncio.to_thread(probe_resend),
+        asyncio.to_thread(probe_disk)
+    )
+    # Swap in a new dict so readers never observe a half-updated cache
+    health_cache = {
+        "checked_at": datetime.utcnow(),
+        "monotonic": time.monotonic(),
+        "checks": {
+            "mongodb": mongodb_result,
+            "resend": resend_result,
+            "disk": disk_result
+        }
+    }
+    return health_cache
+
+async def health_probe_loop():
+    """Background task that refreshes the health cache every HEALTH_PROBE_INTERVAL seconds"""
+    while True:
+        try:
+            await run_health_probes()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Health probe run failed: {e}")
+        await asyncio.sleep(HEALTH_PROBE_INTERVAL)
+
+def bson_default(obj):
+    """Encode BSON types that orjson does not support natively"""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Decimal128):
+        return str(obj.to_decimal())
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class MongoJSONResponse(JSONResponse):
+    """JSON response that serializes MongoDB documents in a single orjson pass.
+
+    ObjectId and Decimal128 are encoded as strings and datetimes as ISO 8601,
+    so handlers can return raw documents without converting them first.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=bson_default, option=orjson.OPT_NON_STR_KEYS)
+
+# ============================================================================
+# STORAGE BACKENDS
+# ============================================================================
+
+class LocalStorageBackend:
+    """Files on this node's disk, served by the /images and /uploads static mounts.
+
+    Keys are POSIX paths relative to the working directory, e.g.
+    images/3f/a2/<name> or uploads/blobs/<aa>/<bb>/<sha256>.
+    """
+
+    name = "local"
+
+    def __init__(self, root="."):
+        self.root = Path(root)
+
+    def path(self, key):
+        return self.root / key
+
+    def put_file(self, key, source_path):
+        """Move a finished local file into place"""
+        target = self.path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source_path, target)
+
+    def put_stream(self, key, stream):
+        """Write a readable binary stream to key"""
+        target = self.path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, "wb") as buffer:
+            shutil.copyfileobj(stream, buffer, UPLOAD_CHUNK_SIZE)
+
+    def open(self, key):
+        return open(self.path(key), "rb")
+
+    def exists(self, key):
+        return self.path(key).exists()
+
+    def modified_time(self, key):
+        return self.path(key).stat().st_mtime
+
+    def touch(self, key):
+        os.utime(self.path(key))
+
+    def delete(self, key):
+        """Remove key; returns False if it did not exist"""
+        try:
+            self.path(key).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def move(self, key, target_key):
+        """Rename key to target_key, stamping it with the move time"""
+        target = self.path(target_key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(self.path(key), target)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            # QUARANTINE_DIR may be on another filesystem; fall back to copy and delete
+            shutil.move(self.path(key), target)
+        os.utime(target)
+
+    def list_files(self, prefix):
+        """Dict of path below prefix to size"""
+        return scan_directory_index(self.path(prefix), with_sizes=True)
+
+    def read_url(self, key, filename=None, content_type=None):
+        """Local files are streamed by the app itself, so there is no external URL"""
+        return None
+
+class S3StorageBackend:
+    """Objects in an S3-compatible bucket (AWS S3, MinIO, ...) shared by every node.
+
+    Uploads above S3_MULTIPART_THRESHOLD are sent as concurrent multipart
+    uploads, and reads are handed to the client as short-lived presigned URLs
+    so file bytes never pass through the API process.
+    """
+
+    name = "s3"
+
+    def __init__(self):
+        try:
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+            from botocore.exceptions import ClientError
+        except ImportError as e:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 (pip install boto3)") from e
+        if not S3_BUCKET:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires S3_BUCKET")
+        
+        self.bucket = S3_BUCKET
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=S3_ENDPOINT_URL,
+            region_name=S3_REGION,
+            aws_access_key_id=S3_ACCESS_KEY_ID,
+            aws_secret_access_key=S3_SECRET_ACCESS_KEY
+        )
+        self.client_error = ClientError
+        self.transfer_config = TransferConfig(
+            multipart_threshold=S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=S3_MAX_CONCURRENCY,
+            use_threads=True
+        )
+
+    def _is_missing(self, error):
+        return error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+    def _head(self, key):
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)
+        except self.client_error as e:
+            if self._is_missing(e):
+                return None
+            raise
+
+    def put_file(self, key, source_path):
+        """Upload a finished local file, then remove the local copy"""
+        self.client.upload_file(str(source_path), self.bucket, key, Config=self.transfer_config)
+        Path(source_path).unlink()
+
+    def put_stream(self, key, stream):
+        """Upload a readable binary stream to key"""
+        self.client.upload_fileobj(stream, self.bucket, key, Config=self.transfer_config)
+
+    def open(self, key):
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+        except self.client_error as e:
+            if self._is_missing(e):
+                raise FileNotFoundError(key) from e
+            raise
+
+    def exists(self, key):
+        return self._head(key) is not None
+
+    def modified_time(self, key):
+        head = self._head(key)
+        if head is None:
+            raise FileNotFoundError(key)
+        return head["LastModified"].timestamp()
+
+    def touch(self, key):
+        """Refresh LastModified by copying the object onto itself.
+
+        S3 only allows a self-copy that replaces the metadata, so the current
+        metadata and content headers are read first and written back unchanged.
+        """
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=key)
+        except self.client_error as e:
+            if self._is_missing(e):
+                raise FileNotFoundError(key) from e
+            raise
+        headers = {
+            name: head[name]
+            for name in ("ContentType", "CacheControl", "ContentDisposition", "ContentEncoding", "ContentLanguage")
+            if head.get(name)
+        }
+        self.client.copy_object(
+            Bucket=self.bucket,
+            Key=key,
+            CopySource={"Bucket": self.bucket, "Key": key},
+            MetadataDirective="REPLACE",
+            Metadata=head.get("Metadata", {}),
+            **headers
+        )
+
+    def delete(self, key):
+        """Remove key (S3 deletes are idempotent, so this always reports True)"""
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+        return True
+
+    def move(self, key, target_key):
+        try:
+            self.client.copy_object(
+                Bucket=self.bucket,
+                Key=target_key,
+                CopySource={"Bucket": self.bucket, "Key": key}
+            )
+        except self.client_error as e:
+            if self._is_missing(e):
+                raise FileNotFoundError(key) from e
+            raise
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def list_files(self, prefix):
+        """Dict of path below prefix to size"""
+        files = {}
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=f"{prefix}/"):
+            for obj in page.get("Contents", []):
+                files[obj["Key"][len(prefix) + 1:]] = obj["Size"]
+        return files
+
+    def read_url(self, key, filename=None, content_type=None):
+        """Presigned GET URL for key, optionally forcing a download file name"""
+        params = {"Bucket": self.bucket, "Key": key}
+        if filename:
+            params["ResponseContentDisposition"] = f"attachment; filename*=UTF-8''{quote(filename)}"
+        if content_type:
+            params["ResponseContentType"] = content_type
+        return self.client.generate_presigned_url("get_object", Params=params, ExpiresIn=S3_PRESIGN_EXPIRES)
+
+def create_storage_backend():
+    """Storage driver selected by STORAGE_BACKEND"""
+    if STORAGE_BACKEND == "s3":
+        backend = S3StorageBackend()
+        logger.info(f"🪣 Using S3 storage backend (bucket={S3_BUCKET}, endpoint={S3_ENDPOINT_URL or 'AWS'})")
+        return backend
+    if STORAGE_BACKEND != "local":
+        raise RuntimeError(f"Unknown STORAGE_BACKEND '{STORAGE_BACKEND}' (expected 'local' or 's3')")
+    return LocalStorageBackend()
+
+storage = create_storage_backend()
+
+def image_storage_key(relative_path):
+    """Storage key of a gallery image given its path below /images/"""
+    return f"{IMAGES_DIR.as_posix()}/{relative_path}"
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan event handler for startup and shutdown"""
@@ -364,15 +1211,47 @@ async def lifespan(app: FastAPI):
         logger.info("1. Create a .env file in the backend directory")
         logger.info("2. Add your MongoDB connection string: MONGODB_CONNECTION_STRING=your_connection_string")
         logger.info("3. Restart the server")
+        if MONGODB_CONNECTION_STRING:
+            logger.info("The MongoDB connection supervisor will keep retrying in the background")
     else:
         logger.info("✅ Gallery management system ready")
         logger.info("✅ Admin system ready")
         logger.info("✅ Dual email notification system ready")
         logger.info("✅ File upload system ready")
     
+    global health_probe_task, mongodb_supervisor_task, spool_replay_task
+    if MONGODB_CONNECTION_STRING:
+        mongodb_supervisor_task = asyncio.create_task(mongodb_supervisor_loop())
+    health_probe_task = asyncio.create_task(health_probe_loop())
+    spool_replay_task = asyncio.create_task(spool_replay_loop())
+    if CONTACT_BATCH_WRITES:
+        start_contact_batch_writer()
+    global orphan_gc_task
+    if ORPHAN_GC_ENABLED:
+        orphan_gc_task = asyncio.create_task(orphan_gc_loop())
+    global submission_events_loop, submission_change_stream_task
+    submission_events_loop = asyncio.get_running_loop()
+    if SUBMISSION_CHANGE_STREAM_ENABLED:
+        submission_change_stream_task = asyncio.create_task(submission_change_stream_loop())
+    global archive_task
+    if ARCHIVE_ENABLED:
+        archive_task = asyncio.create_task(archive_loop())
+    
     yield
     
     # Shutdown
+    await stop_contact_batch_writer()
+    health_probe_task.cancel()
+    spool_replay_task.cancel()
+    if orphan_gc_task:
+        orphan_gc_task.cancel()
+    if submission_change_stream_task:
+        submission_change_stream_stop.set()
+        submission_change_stream_task.cancel()
+    if archive_task:
+        archive_task.cancel()
+    if mongodb_supervisor_task:
+        mongodb_supervisor_task.cancel()
     close_mongodb_connection()
 
 # Initialize FastAPI app with lifespan
@@ -380,12 +1259,24 @@ app = FastAPI(
     title="MECHGENZ Contact Form API",
     description="Backend API for handling contact form submissions with file uploads and gallery management",
     version="1.0.0",
+    default_response_class=MongoJSONResponse,
     lifespan=lifespan
 )
 
 # Mount static files for image and upload serving
-app.mount("/images", StaticFiles(directory="images"), name="images")
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+if storage.name == "local":
+    app.mount("/images", StaticFiles(directory="images"), name="images")
+    app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+else:
+    @app.get("/images/{key:path}", include_in_schema=False)
+    async def redirect_image(key: str):
+        """Send image requests to the object store"""
+        return RedirectResponse(storage.read_url(image_storage_key(key)), status_code=307)
+
+    @app.get("/uploads/{key:path}", include_in_schema=False)
+    async def redirect_upload(key: str):
+        """Send upload requests to the object store"""
+        return RedirectResponse(storage.read_url(f"{UPLOAD_DIR.as_posix()}/{key}"), status_code=307)
 
 # Get CORS origins from environment variable
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:5173").split(",")
@@ -400,18 +1291,122 @@ app.add_middleware(
     expose_headers=["X-Total-Count", "Content-Range", "Access-Control-Expose-Headers"]
 )
 
-# Add a middleware to include proper headers for admin panels
-@app.middleware("http")
-async def add_cors_and_pagination_headers(request: Request, call_next):
-    response = await call_next(request)
+def match_admission_route(method, path):
+    """Name of the admission-controlled route a request belongs to, if any"""
+    for name, route_method, pattern, _ in ADMISSION_ROUTES:
+        if method == route_method and pattern.match(path):
+            return name
+    return None
+
+async def acquire_admission_slot(route):
+    """Wait briefly for a concurrency slot on route; False means shed the request"""
+    stats = admission_stats["routes"][route]
+    semaphore = admission_semaphores[route]
+    if semaphore.locked() and stats["waiting"] >= ADMISSION_MAX_QUEUE:
+        return False
     
-    # Add CORS headers
-    response.headers["Access-Control-Allow-Origin"] = "*"
-    response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
-    response.headers["Access-Control-Allow-Headers"] = "*"
-    response.headers["Access-Control-Expose-Headers"] = "X-Total-Count, Content-Range"
+    stats["waiting"] += 1
+    stats["max_waiting"] = max(stats["max_waiting"], stats["waiting"])
+    try:
+        await asyncio.wait_for(semaphore.acquire(), ADMISSION_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        stats["waiting"] -= 1
     
-    return response
+    stats["active"] += 1
+    stats["admitted"] += 1
+    return True
+
+def release_admission_slot(route):
+    admission_stats["routes"][route]["active"] -= 1
+    admission_semaphores[route].release()
+
+class AdmissionControlMiddleware:
+    """Shed load before request bodies are buffered.
+
+    Every request with a body reserves its Content-Length against
+    ADMISSION_MAX_INFLIGHT_BYTES (uploads without one reserve MAX_FILE_SIZE),
+    and upload routes also need a slot from their route semaphore. Requests
+    that cannot be admitted within ADMISSION_QUEUE_TIMEOUT get an immediate
+    503 with Retry-After instead of slowing every other request down.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
+        route = match_admission_route(scope["method"], scope["path"])
+        content_length = Headers(scope=scope).get("content-length")
+        try:
+            reserved = int(content_length) if content_length else (MAX_FILE_SIZE if route else 0)
+        except ValueError:
+            reserved = MAX_FILE_SIZE if route else 0
+        
+        # A single body larger than the budget is still admitted when nothing else is in flight
+        inflight = admission_stats["inflight_bytes"]
+        if reserved and inflight and inflight + reserved > ADMISSION_MAX_INFLIGHT_BYTES:
+            admission_stats["rejected_over_budget"] += 1
+            if route:
+                admission_stats["routes"][route]["rejected"] += 1
+            return await self.reject(scope, receive, send, route, "in-flight body budget exhausted")
+        
+        admission_stats["inflight_bytes"] += reserved
+        try:
+            if route is None:
+                return await self.app(scope, receive, send)
+            if not await acquire_admission_slot(route):
+                admission_stats["routes"][route]["rejected"] += 1
+                return await self.reject(scope, receive, send, route, "concurrency limit reached")
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                release_admission_slot(route)
+        finally:
+            admission_stats["inflight_bytes"] -= reserved
+
+    async def reject(self, scope, receive, send, route, reason):
+        logger.warning(f"🚦 Shedding {scope['method']} {scope['path']} ({route or 'global'}): {reason}")
+        response = JSONResponse(
+            {"detail": "Server is busy, please retry shortly"},
+            status_code=503,
+            headers={"Retry-After": str(ADMISSION_RETRY_AFTER)}
+        )
+        await response(scope, receive, send)
+
+app.add_middleware(AdmissionControlMiddleware)
+
+# Add a middleware to include proper headers for admin panels
+class CorsAndPaginationHeadersMiddleware:
+    """Add CORS and pagination headers to every response.
+
+    Written as plain ASGI rather than @app.middleware("http") so response
+    bodies are not re-streamed through the middleware, which lets file
+    downloads keep their zero-copy send extensions.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["Access-Control-Allow-Origin"] = "*"
+                headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
+                headers["Access-Control-Allow-Headers"] = "*"
+                headers["Access-Control-Expose-Headers"] = "X-Total-Count, Content-Range, ETag"
+            await send(message)
+        
+        await self.app(scope, receive, send_with_headers)
+
+app.add_middleware(CorsAndPaginationHeadersMiddleware)
 
 # Health check endpoint
 @app.get("/")
@@ -431,14 +1426,14 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Detailed health check endpoint"""
+    """Detailed health check endpoint (MongoDB status comes from the background prober)"""
     try:
-        # Test MongoDB connection
-        if mongodb_client and is_db_connected:
-            mongodb_client.admin.command('ping')
-            db_status = "connected"
-        else:
-            db_status = "disconnected"
+        mongodb_check = health_cache["checks"].get("mongodb")
+        if mongodb_check is None:
+            mongodb_check = await asyncio.to_thread(probe_mongodb)
+        if mongodb_check["status"] == "error":
+            raise Exception(mongodb_check.get("error", "MongoDB ping failed"))
+        db_status = "connected" if mongodb_check["status"] == "ok" else "disconnected"
         
         return {
             "status": "healthy",
@@ -463,10 +1458,59 @@ async def health_check():
             }
         )
 
+@app.get("/livez")
+async def liveness_check():
+    """Liveness probe - never touches the database or the network"""
+    return {
+        "status": "alive",
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+@app.get("/readyz")
+async def readiness_check():
+    """Readiness probe served from the background health prober cache"""
+    checks = health_cache["checks"]
+    cache_age = None
+    if health_cache["monotonic"] is not None:
+        cache_age = round(time.monotonic() - health_cache["monotonic"], 1)
+    
+    # Readiness only depends on MongoDB and disk; Resend failures only affect notifications
+    stale = cache_age is None or cache_age > HEALTH_CACHE_TTL
+    ready = (
+        not stale
+        and is_db_connected
+        and checks.get("mongodb", {}).get("status") == "ok"
+        and checks.get("disk", {}).get("status") == "ok"
+    )
+    
+    return MongoJSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "stale": stale,
+            "cache_age_seconds": cache_age,
+            "checked_at": health_cache["checked_at"],
+            "checks": checks,
+            "timestamp": datetime.utcnow()
+        }
+    )
+
 # ============================================================================
 # ADMIN PROFILE ENDPOINTS
 # ============================================================================
 
+def admin_profile_data():
+    """Profile of the admin user without sensitive fields, or None"""
+    admin = admin_collection.find_one({})
+    if not admin:
+        return None
+    return {
+        "name": admin.get("name", ""),
+        "email": admin.get("email", ""),
+        "created_at": admin.get("created_at", "").isoformat() if admin.get("created_at") else "",
+        "updated_at": admin.get("updated_at", "").isoformat() if admin.get("updated_at") else ""
+    }
+
 @app.get("/api/admin/profile")
 async def get_admin_profile():
     """Get admin profile information"""
@@ -478,21 +1522,13 @@ async def get_admin_profile():
             )
         
         # Get the first (and should be only) admin user
-        admin = admin_collection.find_one({})
-        if not admin:
+        admin_data = admin_profile_data()
+        if not admin_data:
             raise HTTPException(
                 status_code=404,
                 detail="Admin profile not found"
             )
         
-        # Remove sensitive data
-        admin_data = {
-            "name": admin.get("name", ""),
-            "email": admin.get("email", ""),
-            "created_at": admin.get("created_at", "").isoformat() if admin.get("created_at") else "",
-            "updated_at": admin.get("updated_at", "").isoformat() if admin.get("updated_at") else ""
-        }
-        
         return {
             "success": True,
             "admin": admin_data
@@ -581,6 +1617,7 @@ async def update_admin_profile(request: Request):
                 status_code=500,
                 detail="Failed to update admin profile"
             )
+        invalidate_dashboard_cache()
         
         # Return updated admin data (without password)
         updated_admin = {
@@ -664,60 +1701,1879 @@ async def admin_login(request: Request):
 # FILE UPLOAD AND SERVING ENDPOINTS
 # ============================================================================
 
-@app.get("/api/submissions/{submission_id}/file/{filename}")
-async def download_file(submission_id: str, filename: str):
-    """Download a file attached to a submission"""
-    try:
-        if not is_db_connected or collection is None:
-            raise HTTPException(
-                status_code=503,
-                detail="Database connection not available"
-            )
-        
-        # Verify submission exists and contains this file
-        submission = collection.find_one({"_id": ObjectId(submission_id)})
-        if not submission:
-            raise HTTPException(
-                status_code=404,
-                detail="Submission not found"
-            )
-        
-        # Check if file exists in submission
-        uploaded_files = submission.get("uploaded_files", [])
-        file_info = None
-        for file_data in uploaded_files:
-            if file_data.get("saved_name") == filename:
-                file_info = file_data
-                break
+class ZeroCopyFileResponse(FileResponse):
+    """FileResponse that hands the file to the server when it can send it zero-copy.
+
+    Servers advertising the ASGI "http.response.pathsend" extension get the
+    path for whole-file responses, and servers advertising
+    "http.response.zerocopysend" get the file descriptor (with an offset for
+    single ranges), so the kernel copies the bytes with sendfile. Everything
+    else falls back to Starlette's chunked reads, including multipart ranges.
+    """
+
+    async def __call__(self, scope, receive, send):
+        self.extensions = scope.get("extensions") or {}
+        await super().__call__(scope, receive, send)
+
+    async def _handle_simple(self, send, send_header_only):
+        if send_header_only:
+            return await super()._handle_simple(send, send_header_only)
+        if "http.response.pathsend" in self.extensions:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            await send({"type": "http.response.pathsend", "path": os.path.abspath(self.path)})
+            return
+        if "http.response.zerocopysend" in self.extensions:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            await self._zerocopy_send(send, 0, int(self.headers["content-length"]))
+            return
+        await super()._handle_simple(send, send_header_only)
+
+    async def _handle_single_range(self, send, start, end, file_size, send_header_only):
+        if send_header_only or "http.response.zerocopysend" not in self.extensions:
+            return await super()._handle_single_range(send, start, end, file_size, send_header_only)
+        self.headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+        self.headers["content-length"] = str(end - start)
+        await send({"type": "http.response.start", "status": 206, "headers": self.raw_headers})
+        await self._zerocopy_send(send, start, end - start)
+
+    async def _zerocopy_send(self, send, offset, count):
+        with open(self.path, "rb") as file:
+            await send({
+                "type": "http.response.zerocopysend",
+                "file": file,
+                "offset": offset,
+                "count": count,
+                "more_body": False
+            })
+
+def lookup_attachment_manifest(submission_id, filename):
+    """Metadata of one attachment, from the per-worker LRU or an $elemMatch projection.
+
+    Entries expire after ATTACHMENT_MANIFEST_CACHE_TTL seconds, which bounds
+    how long a worker can serve a submission deleted by another worker when
+    no change stream is available to tell it.
+    """
+    cache_key = (submission_id, filename)
+    cached = attachment_manifest_cache.get(cache_key)
+    if cached is not None:
+        expires_at, file_info = cached
+        if expires_at > time.monotonic():
+            attachment_manifest_cache.move_to_end(cache_key)
+            return file_info
+        attachment_manifest_cache.pop(cache_key, None)
+    
+    # Fetch only the matching manifest entry instead of the whole submission
+    submission = find_submission(
+        {"_id": ObjectId(submission_id)},
+        {"_id": 0, "uploaded_files": {"$elemMatch": {"saved_name": filename}}}
+    )
+    if not submission or not submission.get("uploaded_files"):
+        return None
+    
+    file_info = submission["uploaded_files"][0]
+    attachment_manifest_cache[cache_key] = (time.monotonic() + ATTACHMENT_MANIFEST_CACHE_TTL, file_info)
+    while len(attachment_manifest_cache) > ATTACHMENT_MANIFEST_CACHE_SIZE:
+        attachment_manifest_cache.popitem(last=False)
+    return file_info
+
+def invalidate_attachment_manifest(submission_id, uploaded_files):
+    """Drop cached download metadata for a submission's attachments"""
+    for file_info in uploaded_files:
+        attachment_manifest_cache.pop((str(submission_id), file_info.get("saved_name")), None)
+
+def forget_submission_manifests(submission_id):
+    """Drop every cached attachment of a submission deleted elsewhere (only its id is known)"""
+    for cache_key in [cache_key for cache_key in attachment_manifest_cache if cache_key[0] == submission_id]:
+        attachment_manifest_cache.pop(cache_key, None)
+
+def etag_matches(if_none_match, etag):
+    """Whether an If-None-Match header value matches etag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag.removeprefix("W/") in [tag.removeprefix("W/") for tag in candidates]
+
+@app.get("/api/submissions/{submission_id}/file/{filename}")
+async def download_file(submission_id: str, filename: str, request: Request):
+    """Download a file attached to a submission (supports Range and If-None-Match)"""
+    try:
+        if not is_db_connected or collection is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Database connection not available"
+            )
         
+        # Verify submission exists and contains this file
+        file_info = lookup_attachment_manifest(submission_id, filename)
         if not file_info:
             raise HTTPException(
                 status_code=404,
                 detail="File not found in submission"
             )
         
+        storage_key = attachment_storage_key(file_info)
+        download_name = file_info.get("original_name", filename)
+        media_type = file_info.get("content_type", "application/octet-stream")
+        
+        # Object stores serve the bytes themselves through a presigned URL
+        redirect_url = storage.read_url(storage_key, download_name, media_type)
+        if redirect_url:
+            return RedirectResponse(redirect_url, status_code=307)
+        
+        # Blob content never changes, so its hash is a strong validator that
+        # answers revalidation without touching the disk
+        if_none_match = request.headers.get("if-none-match")
+        etag = f'"{file_info["sha256"]}"' if file_info.get("sha256") else None
+        if etag and etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        
         # Check if physical file exists
-        file_path = UPLOAD_DIR / filename
-        if not file_path.exists():
+        file_path = storage.path(storage_key)
+        try:
+            stat_result = os.stat(file_path)
+        except FileNotFoundError:
             raise HTTPException(
                 status_code=404,
                 detail="Physical file not found"
             )
         
-        # Return file
-        return FileResponse(
-            path=file_path,
-            filename=file_info.get("original_name", filename),
-            media_type=file_info.get("content_type", "application/octet-stream")
-        )
+        # Return file
+        response = ZeroCopyFileResponse(
+            path=file_path,
+            filename=download_name,
+            media_type=media_type,
+            stat_result=stat_result,
+            headers={"ETag": etag} if etag else None
+        )
+        if not etag and etag_matches(if_none_match, response.headers["etag"]):
+            return Response(status_code=304, headers={"ETag": response.headers["etag"]})
+        return response
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error downloading file: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to download file"
+        )
+
+class ZipStreamSink:
+    """Unseekable write target for zipfile; written bytes are drained after each step"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        chunks, self.chunks = self.chunks, []
+        return chunks
+
+def zip_archive_name(file_info, used_names, folder=""):
+    """Unique path inside the archive for an attachment, keeping its original name"""
+    original = Path(file_info.get("original_name") or file_info["saved_name"]).name
+    stem, suffix = os.path.splitext(original)
+    candidate = f"{folder}{original}"
+    counter = 2
+    while candidate in used_names:
+        candidate = f"{folder}{stem} ({counter}){suffix}"
+        counter += 1
+    used_names.add(candidate)
+    return candidate
+
+def zip_archive_entries(submissions, per_submission_folders):
+    """(archive name, storage key, size, timestamp) for every attachment of the submissions"""
+    entries = []
+    used_names = set()
+    for submission in submissions:
+        folder = f"{submission['_id']}/" if per_submission_folders else ""
+        submitted_at = submission.get("submitted_at") or datetime.utcnow()
+        for file_info in submission.get("uploaded_files", []):
+            entries.append((
+                zip_archive_name(file_info, used_names, folder),
+                attachment_storage_key(file_info),
+                file_info.get("file_size", 0),
+                submitted_at
+            ))
+    return entries
+
+def iter_zip_archive(entries):
+    """Build a ZIP incrementally and yield it chunk by chunk.
+
+    Nothing is buffered beyond one read chunk: zipfile writes local headers and
+    data descriptors into the sink as it goes. Already-compressed formats are
+    STORED so the CPU is not spent deflating JPEGs and PDFs a second time.
+    """
+    sink = ZipStreamSink()
+    with zipfile.ZipFile(sink, "w", allowZip64=True) as archive:
+        for archive_name, storage_key, file_size, timestamp in entries:
+            info = zipfile.ZipInfo(archive_name, date_time=max(timestamp, datetime(1980, 1, 1)).timetuple()[:6])
+            info.file_size = file_size
+            if Path(archive_name).suffix.lower() in ZIP_STORED_EXTENSIONS:
+                info.compress_type = zipfile.ZIP_STORED
+            else:
+                info.compress_type = zipfile.ZIP_DEFLATED
+            try:
+                source = storage.open(storage_key)
+            except FileNotFoundError:
+                logger.warning(f"Skipping missing attachment in ZIP export: {storage_key}")
+                continue
+            with closing(source), archive.open(info, "w") as target:
+                for chunk in iter(lambda: source.read(UPLOAD_CHUNK_SIZE), b""):
+                    target.write(chunk)
+                    yield from sink.drain()
+            yield from sink.drain()
+    yield from sink.drain()
+
+def zip_streaming_response(entries, download_name):
+    """StreamingResponse for a ZIP of the given archive entries"""
+    return StreamingResponse(
+        iter_zip_archive(entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename*=UTF-8''{quote(download_name)}"}
+    )
+
+@app.get("/api/submissions/attachments.zip")
+async def download_submissions_zip(
+    status: Optional[str] = None,
+    ids: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    limit: int = ZIP_EXPORT_MAX_SUBMISSIONS,
+    include_archived: bool = False
+):
+    """Stream one ZIP with the attachments of a filtered set of submissions"""
+    try:
+        if not is_db_connected or collection is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Database connection not available"
+            )
+        
+        try:
+            query_filter = build_submission_filter(
+                status=status,
+                ids=[submission_id for submission_id in (ids or "").split(",") if submission_id.strip()],
+                date_from=date_from,
+                date_to=date_to
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=str(e)
+            )
+        query_filter["uploaded_files.0"] = {"$exists": True}
+        
+        pipeline = submission_tiers_pipeline(query_filter, include_archived) + [
+            {"$sort": {"submitted_at": -1}},
+            {"$limit": max(1, min(limit, ZIP_EXPORT_MAX_SUBMISSIONS))},
+            {"$project": {"uploaded_files": 1, "submitted_at": 1}}
+        ]
+        submissions = list(collection.aggregate(pipeline))
+        if not submissions:
+            raise HTTPException(
+                status_code=404,
+                detail="No submissions with attachments match the filter"
+            )
+        
+        entries = zip_archive_entries(submissions, per_submission_folders=True)
+        logger.info(f"📦 Streaming ZIP of {len(entries)} attachments from {len(submissions)} submissions")
+        return zip_streaming_response(entries, f"submissions_{datetime.utcnow():%Y%m%d_%H%M%S}.zip")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error exporting attachments: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to export attachments"
+        )
+
+@app.get("/api/submissions/{submission_id}/attachments.zip")
+async def download_submission_zip(submission_id: str):
+    """Stream a ZIP with every attachment of one submission"""
+    try:
+        if not is_db_connected or collection is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Database connection not available"
+            )
+        if not ObjectId.is_valid(submission_id):
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid submission id"
+            )
+        
+        submission = find_submission(
+            {"_id": ObjectId(submission_id)},
+            {"uploaded_files": 1, "submitted_at": 1}
+        )
+        if not submission:
+            raise HTTPException(
+                status_code=404,
+                detail="Submission not found"
+            )
+        if not submission.get("uploaded_files"):
+            raise HTTPException(
+                status_code=404,
+                detail="Submission has no attachments"
+            )
+        
+        entries = zip_archive_entries([submission], per_submission_folders=False)
+        return zip_streaming_response(entries, f"submission_{submission_id}.zip")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error exporting attachments: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to export attachments"
+        )
+
+# ============================================================================
+# CONTENT-ADDRESSED ATTACHMENT STORE
+# ============================================================================
+
+def attachment_blob_key(sha256):
+    """Storage key of an attachment blob"""
+    return f"{ATTACHMENT_BLOB_DIR.as_posix()}/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+def attachment_storage_key(file_info):
+    """Storage key of a submission attachment (blob store or legacy flat uploads/)"""
+    if file_info.get("sha256"):
+        return attachment_blob_key(file_info["sha256"])
+    return f"{UPLOAD_DIR.as_posix()}/{file_info['saved_name']}"
+
+def read_stored_file(storage_key):
+    """Whole content of a stored file (blocking; run it in a thread from handlers)"""
+    with closing(storage.open(storage_key)) as f:
+        return f.read()
+
+async def store_attachment_stream(file: UploadFile):
+    """Stream an upload into the blob store, hashing it on the way.
+
+    Returns (sha256, size, counted), or (None, 0, False) for an empty file.
+    Identical content is stored once: a second upload of the same bytes
+    reuses the existing blob. The blob reference is counted here when the
+    database is reachable (counted); a caller that ends up not storing the
+    submission must release a counted reference again.
+    """
+    digest = hashlib.sha256()
+    file_size = 0
+    temp_path = UPLOAD_TMP_DIR / uuid.uuid4().hex
+    try:
+        with open(temp_path, "wb") as buffer:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                file_size += len(chunk)
+                if file_size > MAX_FILE_SIZE:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"File '{file.filename}' is too large. Maximum size: {MAX_FILE_SIZE // (1024*1024)}MB"
+                    )
+                digest.update(chunk)
+                buffer.write(chunk)
+        
+        if file_size == 0:
+            return None, 0, False
+        
+        sha256 = digest.hexdigest()
+        reused, counted = await asyncio.to_thread(acquire_attachment_blob, sha256, file_size, temp_path)
+        if reused:
+            logger.info(f"♻️ Deduplicated attachment {file.filename} -> {sha256[:12]}")
+        return sha256, file_size, counted
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+def retain_attachment_blobs(uploaded_files):
+    """Add one reference per attachment of a newly stored submission"""
+    operations = [
+        pymongo.UpdateOne(
+            {"_id": file_info["sha256"]},
+            {
+                "$inc": {"refcount": 1},
+                "$setOnInsert": {"size": file_info["file_size"], "created_at": datetime.utcnow()}
+            },
+            upsert=True
+        )
+        for file_info in uploaded_files if file_info.get("sha256")
+    ]
+    if operations and attachment_blob_collection is not None:
+        attachment_blob_collection.bulk_write(operations, ordered=False)
+
+def acquire_attachment_blob(sha256, file_size, source_path, keep_source=False):
+    """Count a new reference to a blob, then make sure its file is stored.
+
+    The reference is counted before an existing file is reused, so a release
+    of the last other reference sees it and keeps the file. If a release is
+    already deleting the file, this waits for it to finish and stores the
+    new copy. Returns (reused, counted): counted is False when the database
+    is unavailable, and the caller must count the reference once the
+    submission is stored. source_path is moved into place unless keep_source
+    is set; on failure the reference is dropped again.
+    """
+    try:
+        retain_attachment_blobs([{"sha256": sha256, "file_size": file_size}])
+        counted = attachment_blob_collection is not None
+    except PyMongoError as e:
+        logger.warning(f"⚠️ Could not count a reference to blob {sha256[:12]} yet: {e}")
+        counted = False
+    try:
+        deadline = time.monotonic() + ATTACHMENT_BLOB_RELEASE_TIMEOUT
+        while counted and attachment_blob_collection.count_documents({
+            "_id": sha256,
+            "releasing": {"$gt": datetime.utcnow() - timedelta(seconds=ATTACHMENT_BLOB_RELEASE_TIMEOUT)}
+        }, limit=1):
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Timed out waiting for the release of blob {sha256}")
+            time.sleep(0.05)
+        
+        blob_key = attachment_blob_key(sha256)
+        if storage.exists(blob_key):
+            # Refresh the mtime so the orphan collector's grace period covers the new reference
+            storage.touch(blob_key)
+            return True, counted
+        if keep_source:
+            with open(source_path, "rb") as source:
+                storage.put_stream(blob_key, source)
+        else:
+            storage.put_file(blob_key, source_path)
+        return False, counted
+    except BaseException:
+        if counted:
+            release_attachment_blob(sha256)
+        raise
+
+def release_attachment_blob(sha256):
+    """Drop one reference to a blob and delete it once nothing references it.
+
+    Returns True if the blob file was removed. The refcount is the fast path;
+    before deleting, submissions are checked directly so a missed increment
+    (e.g. a spooled retry of an insert that had already succeeded) can never
+    remove a file that is still in use. The blob is marked "releasing" while
+    its file is deleted; an upload that acquires it meanwhile waits and then
+    stores the file again.
+    """
+    blob_doc = attachment_blob_collection.find_one_and_update(
+        {"_id": sha256},
+        {"$inc": {"refcount": -1}},
+        return_document=pymongo.ReturnDocument.AFTER
+    )
+    if blob_doc is not None and blob_doc.get("refcount", 0) > 0:
+        return False
+    if collection.count_documents({"uploaded_files.sha256": sha256}, limit=1):
+        return False
+    if archive_collection is not None and archive_collection.count_documents({"uploaded_files.sha256": sha256}, limit=1):
+        return False
+    
+    # Claim the deletion; fails if a new reference was counted in the meantime
+    releasing = datetime.utcnow()
+    try:
+        claimed = attachment_blob_collection.update_one(
+            {
+                "_id": sha256,
+                "refcount": {"$not": {"$gt": 0}},
+                "$or": [
+                    {"releasing": {"$exists": False}},
+                    {"releasing": {"$lt": releasing - timedelta(seconds=ATTACHMENT_BLOB_RELEASE_TIMEOUT)}}
+                ]
+            },
+            {"$set": {"releasing": releasing}, "$setOnInsert": {"refcount": 0}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        return False
+    if claimed.matched_count == 0 and claimed.upserted_id is None:
+        return False
+    
+    deleted = storage.delete(attachment_blob_key(sha256))
+    if attachment_blob_collection.delete_one({"_id": sha256, "releasing": releasing, "refcount": {"$lte": 0}}).deleted_count == 0:
+        # Acquired while we were deleting: the waiting upload stores the file again
+        attachment_blob_collection.update_one({"_id": sha256, "releasing": releasing}, {"$unset": {"releasing": ""}})
+    if deleted:
+        logger.info(f"Deleted unreferenced attachment blob: {sha256}")
+    return deleted
+
+def release_submission_file(file_info):
+    """Drop one attachment of a deleted submission: release its blob or unlink the legacy file"""
+    if file_info.get("sha256"):
+        return release_attachment_blob(file_info["sha256"])
+    if storage.delete(attachment_storage_key(file_info)):
+        logger.info(f"Deleted file: {file_info['saved_name']}")
+        return True
+    return False
+
+# ============================================================================
+# SHARDED STORAGE LAYOUT AND DIRECTORY INDEX
+# ============================================================================
+
+def sharded_relative_path(filename):
+    """Two-level hashed location for a file name, e.g. 3f/a2/<filename>"""
+    name_hash = hashlib.md5(filename.encode("utf-8")).hexdigest()
+    return f"{name_hash[:2]}/{name_hash[2:4]}/{filename}"
+
+def image_relative_path_from_url(url):
+    """Path under IMAGES_DIR for a locally served /images/ URL, or None for external URLs"""
+    if not url or not url.startswith("/images/"):
+        return None
+    return url[len("/images/"):]
+
+def scan_directory_index(base_dir, with_sizes=False):
+    """List every file below base_dir in one os.scandir pass.
+
+    Returns a set of POSIX-style relative paths, or a dict of relative path to
+    size when with_sizes is True. Callers check membership against this
+    snapshot instead of calling Path.exists() per document.
+    """
+    index = {} if with_sizes else set()
+    pending = [(str(base_dir), "")]
+    while pending:
+        directory, prefix = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    relative = f"{prefix}{entry.name}"
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, f"{relative}/"))
+                    elif with_sizes:
+                        index[relative] = entry.stat(follow_symlinks=False).st_size
+                    else:
+                        index.add(relative)
+        except FileNotFoundError:
+            continue
+    return index
+
+def migrate_images_layout(dry_run=False):
+    """Move flat images/ files into the sharded layout and repoint gallery URLs"""
+    moved = []
+    with os.scandir(IMAGES_DIR) as entries:
+        flat_files = [entry.name for entry in entries if entry.is_file(follow_symlinks=False)]
+    
+    for filename in flat_files:
+        relative = sharded_relative_path(filename)
+        moved.append({"from": f"/images/{filename}", "to": f"/images/{relative}"})
+        if not dry_run:
+            target = IMAGES_DIR / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(IMAGES_DIR / filename, target)
+    
+    if moved and not dry_run and gallery_collection is not None:
+        with gallery_write() as version:
+            gallery_collection.bulk_write([
+                pymongo.UpdateMany(
+                    {"current_url": move["from"]},
+                    {"$set": {"current_url": move["to"], "updated_at": datetime.utcnow(), "version": version}}
+                )
+                for move in moved
+            ], ordered=False)
+    return moved
+
+def migrate_uploads_layout(dry_run=False):
+    """Move flat legacy uploads/ files into the content-addressed blob store"""
+    migrated = []
+    unreferenced = []
+    with os.scandir(UPLOAD_DIR) as entries:
+        flat_files = [entry.name for entry in entries if entry.is_file(follow_symlinks=False)]
+    
+    # Map legacy saved names to the submissions that reference them in one query
+    legacy_references = {}
+    cursor = collection.find(
+        {"uploaded_files": {"$elemMatch": {"sha256": {"$exists": False}}}},
+        {"uploaded_files.saved_name": 1, "uploaded_files.sha256": 1}
+    )
+    for submission in cursor:
+        for file_info in submission.get("uploaded_files", []):
+            if not file_info.get("sha256"):
+                legacy_references.setdefault(file_info.get("saved_name"), []).append(submission["_id"])
+    
+    for saved_name in flat_files:
+        file_path = UPLOAD_DIR / saved_name
+        referencing = legacy_references.get(saved_name)
+        if not referencing:
+            unreferenced.append(saved_name)
+            continue
+        
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as source:
+            for chunk in iter(lambda: source.read(UPLOAD_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        sha256 = digest.hexdigest()
+        migrated.append({"saved_name": saved_name, "sha256": sha256, "submissions": len(referencing)})
+        if dry_run:
+            continue
+        
+        # Link the blob in first and drop the flat file last, so an interrupted
+        # migration never leaves a submission pointing at a missing file
+        file_size = file_path.stat().st_size
+        blob_path = storage.path(attachment_blob_key(sha256))
+        if not blob_path.exists():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(file_path, blob_path)
+            except OSError:
+                shutil.copy2(file_path, blob_path)
+        
+        for submission_id in referencing:
+            collection.update_one(
+                {"_id": submission_id},
+                {"$set": {"uploaded_files.$[file].sha256": sha256}},
+                array_filters=[{"file.saved_name": saved_name, "file.sha256": {"$exists": False}}]
+            )
+            retain_attachment_blobs([{"sha256": sha256, "file_size": file_size}])
+        file_path.unlink()
+    
+    return migrated, unreferenced
+
+# ============================================================================
+# GALLERY VERSION AND MAINTENANCE
+# ============================================================================
+
+def bump_gallery_version():
+    """Allocate the next gallery version for a change to website images and return it.
+
+    The version is registered as in flight in the same atomic update, so
+    get_gallery_version never reports it (or anything above it) before the
+    write that stamps it has finished. Use gallery_write() rather than
+    calling this directly.
+    """
+    if app_metadata_collection is None:
+        return None
+    now = datetime.utcnow()
+    version_doc = app_metadata_collection.find_one_and_update(
+        {"_id": "gallery_version"},
+        [
+            {"$set": {"version": {"$add": [{"$ifNull": ["$version", 0]}, 1]}, "updated_at": now}},
+            {"$set": {"in_flight": {"$concatArrays": [
+                {"$ifNull": ["$in_flight", []]},
+                [{"version": "$version", "started_at": now}]
+            ]}}}
+        ],
+        upsert=True,
+        return_document=pymongo.ReturnDocument.AFTER
+    )
+    invalidate_dashboard_cache()
+    return version_doc["version"]
+
+def finish_gallery_write(version):
+    """Mark a gallery version as written (and drop abandoned in-flight entries)"""
+    if app_metadata_collection is not None and version is not None:
+        cutoff = datetime.utcnow() - timedelta(seconds=GALLERY_WRITE_TIMEOUT)
+        app_metadata_collection.update_one({"_id": "gallery_version"}, {"$pull": {"in_flight": {"version": version}}})
+        app_metadata_collection.update_one(
+            {"_id": "gallery_version", "in_flight.started_at": {"$lt": cutoff}},
+            {"$pull": {"in_flight": {"started_at": {"$lt": cutoff}}}}
+        )
+    # Clear again now the write is visible, in case a dashboard was cached mid-write
+    invalidate_dashboard_cache()
+
+@contextmanager
+def gallery_write():
+    """Allocate a gallery version for the enclosed write and release it when done"""
+    version = bump_gallery_version()
+    try:
+        yield version
+    finally:
+        finish_gallery_write(version)
+
+def get_gallery_version():
+    """Highest gallery version whose write has finished (0 before the first change).
+
+    While writes are in flight this is just below the oldest of them, so a
+    delta sync cursor never skips a change that commits after it was read.
+    """
+    if app_metadata_collection is None:
+        return 0
+    version_doc = app_metadata_collection.find_one({"_id": "gallery_version"})
+    if not version_doc:
+        return 0
+    cutoff = datetime.utcnow() - timedelta(seconds=GALLERY_WRITE_TIMEOUT)
+    pending = [
+        entry["version"] for entry in version_doc.get("in_flight", [])
+        if entry.get("started_at") and entry["started_at"] > cutoff
+    ]
+    return min(pending) - 1 if pending else version_doc.get("version", 0)
+
+def record_gallery_tombstones(image_ids, version):
+    """Record complete deletions of gallery slots at the given version"""
+    if gallery_tombstone_collection is None or not image_ids:
+        return
+    now = datetime.utcnow()
+    gallery_tombstone_collection.bulk_write([
+        pymongo.ReplaceOne(
+            {"_id": image_id},
+            {"version": version, "deleted_at": now},
+            upsert=True
+        )
+        for image_id in image_ids
+    ], ordered=False)
+
+def parse_gallery_since(since):
+    """Query for a since= value: a gallery version, or an ISO 8601 timestamp (raises ValueError).
+
+    updated_at is stamped before a write lands, so a timestamp is widened by
+    GALLERY_WRITE_TIMEOUT to re-send writes that were still in flight then.
+    """
+    if since.isdigit():
+        return {"version": {"$gt": int(since)}}, {"version": {"$gt": int(since)}}
+    moment = datetime.fromisoformat(since.replace("Z", "+00:00"))
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    moment -= timedelta(seconds=GALLERY_WRITE_TIMEOUT)
+    return {"updated_at": {"$gt": moment}}, {"deleted_at": {"$gt": moment}}
+
+def plan_gallery_repairs():
+    """Find gallery slots whose local image file is missing, in a single pass.
+
+    Returns (repairs, existing_files). Each repair describes the current_url
+    change that would reset the slot to its default image.
+    """
+    image_sizes = storage.list_files(IMAGES_DIR.as_posix())
+    repairs = []
+    existing_files = []
+    cursor = gallery_collection.find({}, {"id": 1, "current_url": 1, "default_url": 1})
+    for doc in cursor:
+        current_url = doc.get("current_url", "")
+        filename = image_relative_path_from_url(current_url)
+        if filename is None:
+            continue
+        if filename in image_sizes:
+            existing_files.append({
+                "image_id": doc.get("id", ""),
+                "filename": filename,
+                "size": image_sizes[filename]
+            })
+        else:
+            repairs.append({
+                "_id": doc["_id"],
+                "image_id": doc.get("id", ""),
+                "field": "current_url",
+                "missing_file": filename,
+                "from": current_url,
+                "to": doc.get("default_url", "")
+            })
+    return repairs, existing_files
+
+def run_gallery_maintenance(dry_run=False):
+    """Reset every broken gallery slot with one unordered bulk_write.
+
+    In dry-run mode only the diff is returned. Otherwise each reset is
+    guarded on the current_url it was planned from, so a slot re-uploaded
+    in the meantime is left alone, and the gallery version is bumped once.
+    """
+    repairs, _ = plan_gallery_repairs()
+    fixed_count = 0
+    gallery_version = None
+    if repairs and not dry_run:
+        now = datetime.utcnow()
+        with gallery_write() as gallery_version:
+            result = gallery_collection.bulk_write([
+                pymongo.UpdateOne(
+                    {"_id": repair["_id"], "current_url": repair["from"]},
+                    {"$set": {"current_url": repair["to"], "updated_at": now, "version": gallery_version}}
+                )
+                for repair in repairs
+            ], ordered=False)
+        fixed_count = result.modified_count
+        logger.info(f"🔧 Gallery maintenance reset {fixed_count} broken slots (version {gallery_version})")
+    
+    for repair in repairs:
+        repair.pop("_id", None)
+    return {
+        "dry_run": dry_run,
+        "fixed_count": len(repairs) if dry_run else fixed_count,
+        "repairs": repairs,
+        "gallery_version": gallery_version
+    }
+
+# ============================================================================
+# ORPHAN FILE GARBAGE COLLECTION
+# ============================================================================
+
+def collect_referenced_files():
+    """Relative paths under images/ and uploads/ that are still referenced.
+
+    Sources are the gallery URLs, submission attachments (hot and archived)
+    and submissions still waiting in the spool (they reference files but are
+    not in MongoDB yet).
+    """
+    referenced_images = set()
+    for doc in gallery_collection.find({}, {"current_url": 1, "default_url": 1}):
+        for url in (doc.get("current_url"), doc.get("default_url")):
+            relative = image_relative_path_from_url(url)
+            if relative:
+                referenced_images.add(relative)
+    
+    attachment_lists = [
+        doc.get("uploaded_files", [])
+        for source in (collection, archive_collection) if source is not None
+        for doc in source.find(
+            {"uploaded_files.0": {"$exists": True}},
+            {"uploaded_files.saved_name": 1, "uploaded_files.sha256": 1}
+        )
+    ]
+    with spool_lock:
+        spool_paths = [path for path in (CONTACT_SPOOL_REPLAY_FILE, CONTACT_SPOOL_FILE) if path.exists()]
+        spooled = [doc for path in spool_paths for doc in read_spool_file(path)]
+    attachment_lists.extend(doc.get("uploaded_files", []) for doc in spooled)
+    
+    referenced_uploads = set()
+    for uploaded_files in attachment_lists:
+        for file_info in uploaded_files:
+            referenced_uploads.add(attachment_storage_key(file_info)[len(UPLOAD_DIR.as_posix()) + 1:])
+    
+    # Partial files of resumable uploads that are still in progress
+    if upload_session_collection is not None:
+        for session in upload_session_collection.find({}, {"_id": 1}):
+            referenced_uploads.add(upload_session_partial_path(session["_id"]).relative_to(UPLOAD_DIR).as_posix())
+    
+    return referenced_images, referenced_uploads
+
+def quarantine_file(key):
+    """Move a stored file under QUARANTINE_DIR, stamping it with the quarantine time"""
+    storage.move(key, f"{QUARANTINE_DIR.as_posix()}/{key}")
+
+def purge_quarantine(now):
+    """Permanently delete quarantined files older than ORPHAN_QUARANTINE_RETENTION"""
+    purged = 0
+    reclaimed_bytes = 0
+    quarantine_prefix = QUARANTINE_DIR.as_posix()
+    for relative, size in storage.list_files(quarantine_prefix).items():
+        key = f"{quarantine_prefix}/{relative}"
+        try:
+            if now - storage.modified_time(key) < ORPHAN_QUARANTINE_RETENTION:
+                continue
+            storage.delete(key)
+            purged += 1
+            reclaimed_bytes += size
+        except FileNotFoundError:
+            continue
+    return purged, reclaimed_bytes
+
+def sweep_orphan_files(dry_run=False):
+    """Quarantine unreferenced files in images/ and uploads/ and purge old quarantine.
+
+    Files younger than ORPHAN_GC_GRACE_PERIOD are skipped so uploads that are
+    still between their file write and database insert are never touched.
+    At most ORPHAN_GC_MAX_FILES_PER_SWEEP files are moved, at
+    ORPHAN_GC_FILES_PER_SECOND, to keep the sweep off the request path's disk.
+    """
+    global orphan_gc_last_report
+    if not orphan_gc_lock.acquire(blocking=False):
+        return {"skipped": "A sweep is already running"}
+    try:
+        started = time.monotonic()
+        now = time.time()
+        referenced_images, referenced_uploads = collect_referenced_files()
+        candidates = [
+            (IMAGES_DIR, relative, size)
+            for relative, size in storage.list_files(IMAGES_DIR.as_posix()).items()
+            if relative not in referenced_images
+        ] + [
+            (UPLOAD_DIR, relative, size)
+            for relative, size in storage.list_files(UPLOAD_DIR.as_posix()).items()
+            if relative not in referenced_uploads
+        ]
+        
+        report = {
+            "dry_run": dry_run,
+            "started_at": datetime.utcnow(),
+            "referenced_files": len(referenced_images) + len(referenced_uploads),
+            "orphans_found": len(candidates),
+            "skipped_recent": 0,
+            "quarantined": 0,
+            "quarantined_bytes": 0,
+            "quarantined_files": [],
+            "failed": 0,
+            "purged": 0,
+            "reclaimed_bytes": 0
+        }
+        
+        delay = 1 / ORPHAN_GC_FILES_PER_SECOND if ORPHAN_GC_FILES_PER_SECOND > 0 else 0
+        for base_dir, relative, size in candidates:
+            if report["quarantined"] >= ORPHAN_GC_MAX_FILES_PER_SWEEP:
+                break
+            key = f"{base_dir.as_posix()}/{relative}"
+            try:
+                if now - storage.modified_time(key) < ORPHAN_GC_GRACE_PERIOD:
+                    report["skipped_recent"] += 1
+                    continue
+                if not dry_run:
+                    quarantine_file(key)
+                    if base_dir == UPLOAD_DIR and relative.startswith("blobs/") and attachment_blob_collection is not None:
+                        attachment_blob_collection.delete_one({"_id": Path(relative).name})
+                    time.sleep(delay)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                # One unmovable file must not abort the whole sweep
+                logger.warning(f"⚠️ Could not quarantine {key}: {e}")
+                report["failed"] += 1
+                continue
+            report["quarantined"] += 1
+            report["quarantined_bytes"] += size
+            report["quarantined_files"].append(key)
+        
+        if not dry_run:
+            report["purged"], report["reclaimed_bytes"] = purge_quarantine(now)
+        
+        report["duration_seconds"] = round(time.monotonic() - started, 2)
+        report["reclaimed"] = format_file_size(report["reclaimed_bytes"])
+        logger.info(
+            f"🧹 Orphan sweep (dry_run={dry_run}): {report['quarantined']} quarantined "
+            f"({format_file_size(report['quarantined_bytes'])}), {report['failed']} failed, {report['purged']} purged "
+            f"({report['reclaimed']} reclaimed)"
+        )
+        if not dry_run:
+            orphan_gc_last_report = report
+        return report
+    finally:
+        orphan_gc_lock.release()
+
+async def orphan_gc_loop():
+    """Background task that runs the orphan sweep every ORPHAN_GC_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(ORPHAN_GC_INTERVAL)
+        try:
+            if is_db_connected and collection is not None and gallery_collection is not None:
+                await asyncio.to_thread(sweep_orphan_files)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Orphan sweep failed: {e}")
+
+# ============================================================================
+# CONTACT SUBMISSION SPOOL (WRITE-AHEAD LOG)
+# ============================================================================
+
+def spool_submission(submission_data):
+    """Durably append a submission to the on-disk spool (fsync'd JSON lines)"""
+    line = json_util.dumps(submission_data, json_options=json_util.RELAXED_JSON_OPTIONS)
+    with spool_lock:
+        with open(CONTACT_SPOOL_FILE, "a", encoding="utf-8") as spool_file:
+            spool_file.write(line + "\n")
+            spool_file.flush()
+            os.fsync(spool_file.fileno())
+    logger.info(f"📥 Spooled submission {submission_data['_id']} to {CONTACT_SPOOL_FILE}")
+
+def read_spool_file(spool_path):
+    """Read spooled submissions, skipping a torn final line left by a crash"""
+    documents = []
+    with open(spool_path, "r", encoding="utf-8") as spool_file:
+        for line_number, line in enumerate(spool_file, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                documents.append(json_util.loads(line))
+            except ValueError as e:
+                logger.error(f"Skipping unreadable spool line {line_number} in {spool_path}: {e}")
+    return documents
+
+def insert_submissions_idempotent(documents):
+    """Insert submissions with insert_many, treating already-present _ids as success.
+
+    Returns the documents that were newly inserted by this call.
+    """
+    if not documents:
+        return []
+    try:
+        collection.insert_many(documents, ordered=False)
+        return documents
+    except BulkWriteError as e:
+        # Duplicate keys mean an earlier (possibly interrupted) replay already stored them
+        write_errors = e.details.get("writeErrors", [])
+        fatal_errors = [error for error in write_errors if error.get("code") != 11000]
+        if fatal_errors:
+            raise
+        duplicate_indexes = {error["index"] for error in write_errors}
+        return [document for index, document in enumerate(documents) if index not in duplicate_indexes]
+
+def replay_spooled_submissions():
+    """Move spooled submissions into MongoDB in insert_many batches.
+
+    The spool is rotated to a replay file first so new submissions keep
+    appending while the replay runs. Submissions carry their own _id, so a
+    replay interrupted part-way through can be repeated without duplicates.
+    """
+    with spool_lock:
+        if not CONTACT_SPOOL_REPLAY_FILE.exists():
+            if not CONTACT_SPOOL_FILE.exists():
+                return 0
+            os.replace(CONTACT_SPOOL_FILE, CONTACT_SPOOL_REPLAY_FILE)
+    
+    documents = read_spool_file(CONTACT_SPOOL_REPLAY_FILE)
+    inserted_count = 0
+    for start in range(0, len(documents), SPOOL_REPLAY_BATCH_SIZE):
+        batch = documents[start:start + SPOOL_REPLAY_BATCH_SIZE]
+        # Attachment references were counted at upload time, except those listed in uncounted_blobs
+        uncounted_blobs = {document["_id"]: document.pop("uncounted_blobs", []) for document in batch}
+        inserted = insert_submissions_idempotent(batch)
+        for document in inserted:
+            retain_attachment_blobs([
+                file_info for file_info in document.get("uploaded_files", [])
+                if file_info.get("sha256") in uncounted_blobs[document["_id"]]
+            ])
+            notify_submission_event("created", submission_event_summary(document))
+        update_submission_rollup([(document["submitted_at"], 1, {document["status"]: 1}) for document in inserted])
+        inserted_count += len(inserted)
+    
+    CONTACT_SPOOL_REPLAY_FILE.unlink()
+    logger.info(f"✅ Replayed {len(documents)} spooled submissions ({inserted_count} newly inserted)")
+    return len(documents)
+
+def spool_pending_count():
+    """Number of submissions waiting in the spool"""
+    pending = 0
+    with spool_lock:
+        for spool_path in (CONTACT_SPOOL_REPLAY_FILE, CONTACT_SPOOL_FILE):
+            if spool_path.exists():
+                with open(spool_path, "rb") as spool_file:
+                    pending += sum(1 for line in spool_file if line.strip())
+    return pending
+
+async def spool_replay_loop():
+    """Background task that drains the spool whenever MongoDB is available"""
+    while True:
+        try:
+            has_spool = CONTACT_SPOOL_REPLAY_FILE.exists() or CONTACT_SPOOL_FILE.exists()
+            if has_spool and is_db_connected and collection is not None:
+                await asyncio.to_thread(replay_spooled_submissions)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Spool replay failed, will retry: {e}")
+        await asyncio.sleep(SPOOL_REPLAY_INTERVAL)
+
+# ============================================================================
+# CONTACT SUBMISSION WRITE COALESCING
+# ============================================================================
+
+def insert_submission_batch(documents):
+    """Insert one coalesced batch with a single unordered insert_many"""
+    with pymongo.timeout(CONTACT_INSERT_TIMEOUT):
+        collection.insert_many(documents, ordered=False)
+
+async def flush_submission_batch(batch):
+    """Write a batch, resolve each waiting request with its own result, then update the rollup once"""
+    documents = [document for document, _ in batch]
+    failures = {}
+    duplicates = set()
+    try:
+        await asyncio.to_thread(insert_submission_batch, documents)
+    except BulkWriteError as e:
+        # Unordered inserts report failures per document; duplicates are already stored (and counted)
+        for error in e.details.get("writeErrors", []):
+            if error.get("code") == 11000:
+                duplicates.add(error["index"])
+            else:
+                failures[error["index"]] = PyMongoError(error.get("errmsg", "Insert failed"))
+        if e.details.get("writeConcernErrors"):
+            for index in range(len(batch)):
+                failures.setdefault(index, PyMongoError("Write concern error"))
+    except Exception as e:
+        for index in range(len(batch)):
+            failures[index] = e
+    
+    contact_batch_stats["batches"] += 1
+    contact_batch_stats["documents"] += len(batch)
+    contact_batch_stats["largest_batch"] = max(contact_batch_stats["largest_batch"], len(batch))
+    
+    for index, (document, future) in enumerate(batch):
+        if future.done():
+            continue
+        if index in failures:
+            future.set_exception(failures[index])
+        else:
+            future.set_result(document["_id"])
+    
+    # One rollup upsert per day for the whole batch, off the request path
+    await asyncio.to_thread(update_submission_rollup, [
+        (document["submitted_at"], 1, {document["status"]: 1})
+        for index, document in enumerate(documents)
+        if index not in failures and index not in duplicates
+    ])
+
+async def contact_batch_writer_loop():
+    """Collect submissions for up to CONTACT_BATCH_WINDOW_MS or CONTACT_BATCH_MAX_DOCS, then flush.
+
+    A None on the queue is the stop sentinel: the batch collected so far is
+    flushed before the loop exits.
+    """
+    loop = asyncio.get_running_loop()
+    window = CONTACT_BATCH_WINDOW_MS / 1000
+    stopping = False
+    while not stopping:
+        item = await contact_batch_queue.get()
+        if item is None:
+            break
+        batch = [item]
+        deadline = loop.time() + window
+        while len(batch) < CONTACT_BATCH_MAX_DOCS:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(contact_batch_queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if item is None:
+                stopping = True
+                break
+            batch.append(item)
+        try:
+            await flush_submission_batch(batch)
+        except Exception as e:
+            # Fail this batch (its requests fall back to the spool) and keep the writer alive
+            logger.error(f"Coalesced insert of {len(batch)} submissions failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(PyMongoError(f"Coalesced insert failed: {e}"))
+
+def start_contact_batch_writer():
+    """Start the micro-batching writer task"""
+    global contact_batch_queue, contact_batch_task
+    contact_batch_queue = asyncio.Queue()
+    contact_batch_task = asyncio.create_task(contact_batch_writer_loop())
+    logger.info(f"✅ Contact write coalescing enabled ({CONTACT_BATCH_WINDOW_MS}ms window, max {CONTACT_BATCH_MAX_DOCS} docs)")
+
+async def stop_contact_batch_writer():
+    """Stop the writer after it has flushed every queued and in-progress batch"""
+    global contact_batch_task
+    if contact_batch_task is None:
+        return
+    # New submissions insert directly from here on; the sentinel goes behind everything queued
+    task = contact_batch_task
+    contact_batch_task = None
+    await contact_batch_queue.put(None)
+    try:
+        await task
+    except Exception as e:
+        logger.error(f"Contact batch writer exited with an error: {e}")
+    pending = []
+    while not contact_batch_queue.empty():
+        item = contact_batch_queue.get_nowait()
+        if item is not None:
+            pending.append(item)
+    if pending:
+        await flush_submission_batch(pending)
+
+async def insert_submission_batched(submission_data):
+    """Queue a submission for the next coalesced insert_many and wait for its result.
+
+    Raises PyMongoError if the batch does not complete within the window plus
+    CONTACT_INSERT_TIMEOUT, so the caller spools the submission instead of
+    hanging. The spool replay skips it if the batch did land after all.
+    """
+    future = asyncio.get_running_loop().create_future()
+    await contact_batch_queue.put((submission_data, future))
+    try:
+        return await asyncio.wait_for(future, CONTACT_BATCH_WINDOW_MS / 1000 + CONTACT_INSERT_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise PyMongoError("Timed out waiting for the coalesced insert")
+
+# ============================================================================
+# SUBMISSION ARCHIVE
+# ============================================================================
+
+def archive_criteria(now):
+    """Cutoffs for the archival job, stored with its progress so a resumed run uses the same ones"""
+    return {
+        "archive_before": now - timedelta(days=ARCHIVE_AFTER_DAYS),
+        "terminal_statuses": ARCHIVE_TERMINAL_STATUSES,
+        "terminal_before": now - timedelta(days=ARCHIVE_TERMINAL_AFTER_DAYS)
+    }
+
+def archive_filter(criteria):
+    """Hot submissions that are old enough, or closed long enough, to archive"""
+    clauses = [{"submitted_at": {"$lt": criteria["archive_before"]}}]
+    if criteria["terminal_statuses"]:
+        clauses.append({
+            "status": {"$in": criteria["terminal_statuses"]},
+            "submitted_at": {"$lt": criteria["terminal_before"]}
+        })
+    return {"$or": clauses}
+
+def archive_submissions(dry_run=False):
+    """Move archivable submissions to the archive collection in ARCHIVE_BATCH_SIZE batches.
+
+    Each batch is written to the archive (replacing copies left by an
+    interrupted batch) and only then deleted from the hot collection, so a
+    crash at any point loses nothing and the next run simply continues.
+    A submission is only deleted if its status and updated_at are still
+    those that were copied; otherwise (changed or deleted in between) its
+    archive copy is removed again. Progress is kept in app_metadata under
+    "archive_job"; an unfinished job is resumed with its original cutoffs.
+    """
+    if not archive_lock.acquire(blocking=False):
+        return {"skipped": "An archival run is already in progress"}
+    try:
+        job = app_metadata_collection.find_one({"_id": "archive_job"}) or {}
+        resumed = job.get("state") == "running" and not dry_run
+        if resumed:
+            criteria = job["criteria"]
+            logger.info(f"🗄️ Resuming archival job after {job.get('last_id')} ({job.get('moved', 0)} moved so far)")
+        else:
+            criteria = archive_criteria(datetime.utcnow())
+            job = {"criteria": criteria, "moved": 0, "batches": 0, "last_id": None}
+        query = archive_filter(criteria)
+        
+        if dry_run:
+            return {
+                "dry_run": True,
+                "criteria": criteria,
+                "eligible": collection.count_documents(query),
+                "hot_total": collection.estimated_document_count(),
+                "archived_total": archive_collection.estimated_document_count()
+            }
+        
+        started = time.monotonic()
+        job.update(state="running", started_at=job.get("started_at") or datetime.utcnow())
+        app_metadata_collection.replace_one({"_id": "archive_job"}, {"_id": "archive_job", **job}, upsert=True)
+        
+        while True:
+            batch_query = dict(query)
+            if job["last_id"] is not None:
+                batch_query["_id"] = {"$gt": job["last_id"]}
+            batch = list(collection.find(batch_query).sort("_id", 1).limit(ARCHIVE_BATCH_SIZE))
+            if not batch:
+                break
+            
+            # Copies from an interrupted run may be stale, so replace rather than skip them
+            archive_collection.bulk_write([
+                pymongo.ReplaceOne({"_id": document["_id"]}, document, upsert=True)
+                for document in batch
+            ], ordered=False)
+            batch_ids = [document["_id"] for document in batch]
+            moved_ids = []
+            stale_ids = []
+            for document in batch:
+                deleted = collection.delete_one({
+                    "_id": document["_id"],
+                    "status": document.get("status"),
+                    "updated_at": document.get("updated_at")
+                })
+                (moved_ids if deleted.deleted_count else stale_ids).append(document["_id"])
+            if stale_ids:
+                # Updated or deleted since the copy: the hot copy (if any) is authoritative
+                archive_collection.delete_many({"_id": {"$in": stale_ids}})
+            for submission_id in moved_ids:
+                notify_submission_event("archived", {"id": str(submission_id)})
+            
+            job["moved"] += len(moved_ids)
+            job["batches"] += 1
+            job["last_id"] = batch_ids[-1]
+            app_metadata_collection.update_one(
+                {"_id": "archive_job"},
+                {"$set": {"moved": job["moved"], "batches": job["batches"], "last_id": job["last_id"], "updated_at": datetime.utcnow()}}
+            )
+            invalidate_submission_counts()
+            logger.info(f"🗄️ Archived batch {job['batches']}: {job['moved']} submissions moved")
+        
+        report = {
+            "dry_run": False,
+            "resumed": resumed,
+            "moved": job["moved"],
+            "batches": job["batches"],
+            "criteria": criteria,
+            "duration_seconds": round(time.monotonic() - started, 2)
+        }
+        app_metadata_collection.update_one(
+            {"_id": "archive_job"},
+            {"$set": {"state": "completed", "completed_at": datetime.utcnow(), "last_report": report}}
+        )
+        logger.info(f"🗄️ Archival complete: {job['moved']} submissions moved in {job['batches']} batches")
+        return report
+    finally:
+        archive_lock.release()
+
+async def archive_loop():
+    """Background task that runs the archival job every ARCHIVE_INTERVAL seconds"""
+    while True:
+        try:
+            if is_db_connected and archive_collection is not None:
+                await asyncio.to_thread(archive_submissions)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Archival run failed: {e}")
+        await asyncio.sleep(ARCHIVE_INTERVAL)
+
+def find_submission(query, projection=None):
+    """find_one on the hot collection, falling back to the archive (flagged archived: true)"""
+    submission = collection.find_one(query, projection)
+    if submission is None and archive_collection is not None:
+        submission = archive_collection.find_one(query, projection)
+        if submission is not None:
+            submission["archived"] = True
+    return submission
+
+def update_submission(query, update, projection=None):
+    """find_one_and_update on the hot collection, falling back to the archive.
+
+    Returns the document as it was before the update (flagged archived: true
+    if it came from the archive), or None.
+    """
+    previous = collection.find_one_and_update(query, update, projection=projection)
+    if previous is None and archive_collection is not None:
+        previous = archive_collection.find_one_and_update(query, update, projection=projection)
+        if previous is not None:
+            previous["archived"] = True
+    return previous
+
+def submission_tier(document):
+    """Collection holding a document returned by find_submission or update_submission"""
+    return archive_collection if document.get("archived") else collection
+
+def submission_tiers_pipeline(query_filter, include_archived):
+    """Leading stages reading the hot collection, plus the archive when requested.
+
+    Archived documents are tagged with archived: true.
+    """
+    pipeline = [{"$match": query_filter}]
+    if include_archived and archive_collection is not None:
+        pipeline.append({"$unionWith": {
+            "coll": ARCHIVE_COLLECTION_NAME,
+            "pipeline": [{"$match": query_filter}, {"$addFields": {"archived": True}}]
+        }})
+    return pipeline
+
+# ============================================================================
+# IDEMPOTENCY KEYS
+# ============================================================================
+
+def request_fingerprint(payload):
+    """Stable hash of a request payload, used to reject key reuse with a different body"""
+    if not isinstance(payload, bytes):
+        payload = orjson.dumps(payload, default=bson_default, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(payload).hexdigest()
+
+def remember_idempotent_result(key, record):
+    """Keep a completed result in the bounded per-worker cache"""
+    idempotency_local_results[key] = (time.monotonic() + IDEMPOTENCY_KEY_TTL, record)
+    idempotency_local_results.move_to_end(key)
+    while len(idempotency_local_results) > IDEMPOTENCY_LOCAL_CACHE_SIZE:
+        idempotency_local_results.popitem(last=False)
+
+def lookup_local_idempotent_result(key):
+    """Return a cached completed result if it has not expired"""
+    cached = idempotency_local_results.get(key)
+    if cached is None:
+        return None
+    expires_at, record = cached
+    if expires_at < time.monotonic():
+        idempotency_local_results.pop(key, None)
+        return None
+    return record
+
+def claim_idempotency_key(key, fingerprint):
+    """Claim a key in the shared store, returning None if claimed or the existing record"""
+    now = datetime.utcnow()
+    try:
+        idempotency_collection.insert_one({
+            "_id": key,
+            "status": "pending",
+            "fingerprint": fingerprint,
+            "created_at": now,
+            "locked_until": now + timedelta(seconds=IDEMPOTENCY_LOCK_TIMEOUT)
+        })
+        return None
+    except DuplicateKeyError:
+        pass
+    
+    # Take over a pending claim whose lock has expired (e.g. a crashed worker). Claims are
+    # not renewed while running, so IDEMPOTENCY_LOCK_TIMEOUT must outlast the slowest operation.
+    taken_over = idempotency_collection.update_one(
+        {"_id": key, "status": "pending", "locked_until": {"$lt": now}},
+        {"$set": {"locked_until": now + timedelta(seconds=IDEMPOTENCY_LOCK_TIMEOUT), "fingerprint": fingerprint}}
+    )
+    if taken_over.modified_count:
+        return None
+    return idempotency_collection.find_one({"_id": key}) or {"status": "pending"}
+
+def idempotent_response(record, replayed=True):
+    """Build the HTTP response for a stored idempotency record"""
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    if record["status_code"] >= 400:
+        raise HTTPException(status_code=record["status_code"], detail=record["body"], headers=headers)
+    return MongoJSONResponse(content=record["body"], status_code=record["status_code"], headers=headers)
+
+async def wait_for_idempotent_result(key):
+    """Poll the shared store until another worker completes the key"""
+    deadline = time.monotonic() + IDEMPOTENCY_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(0.1)
+        stored = await asyncio.to_thread(idempotency_collection.find_one, {"_id": key})
+        if stored is None:
+            return None
+        if stored.get("status") == "completed":
+            return stored
+    raise HTTPException(
+        status_code=409,
+        detail="A request with this Idempotency-Key is still being processed"
+    )
+
+async def run_idempotent(scope, idempotency_key, fingerprint, operation):
+    """Run operation at most once per Idempotency-Key.
+
+    Repeats of a completed key get the stored response without redoing any
+    I/O, and concurrent duplicates wait for the in-flight result. Successful
+    and client-error (4xx) results are stored; server errors release the key
+    so the client can retry.
+    """
+    if not idempotency_key:
+        return await operation()
+    
+    key = f"{scope}:{idempotency_key.strip()}"
+    
+    # Concurrent duplicate in this worker: wait on the in-flight result
+    inflight = idempotency_inflight.get(key)
+    if inflight is not None:
+        inflight_fingerprint, inflight_future = inflight
+        if inflight_fingerprint != fingerprint:
+            raise HTTPException(
+                status_code=422,
+                detail="Idempotency-Key was already used with a different request payload"
+            )
+        return idempotent_response(await asyncio.shield(inflight_future))
+    
+    record = lookup_local_idempotent_result(key)
+    use_shared_store = is_db_connected and idempotency_collection is not None
+    while record is None and use_shared_store:
+        existing = await asyncio.to_thread(claim_idempotency_key, key, fingerprint)
+        if existing is None:
+            break  # claimed - this request does the work
+        if existing.get("status") == "completed":
+            record = existing
+        else:
+            # Another worker owns the key; if it gives up (record deleted) try to claim again
+            record = await wait_for_idempotent_result(key)
+    
+    if record is not None:
+        if record.get("fingerprint") != fingerprint:
+            raise HTTPException(
+                status_code=422,
+                detail="Idempotency-Key was already used with a different request payload"
+            )
+        return idempotent_response(record)
+    
+    future = asyncio.get_running_loop().create_future()
+    idempotency_inflight[key] = (fingerprint, future)
+    try:
+        try:
+            body = await operation()
+            record = {"status_code": 200, "body": body}
+        except HTTPException as e:
+            if e.status_code >= 500:
+                raise
+            record = {"status_code": e.status_code, "body": e.detail}
+        
+        record["fingerprint"] = fingerprint
+        remember_idempotent_result(key, record)
+        if use_shared_store:
+            try:
+                await asyncio.to_thread(
+                    idempotency_collection.update_one,
+                    {"_id": key},
+                    {"$set": {**record, "status": "completed", "completed_at": datetime.utcnow()}}
+                )
+            except PyMongoError as e:
+                logger.warning(f"⚠️ Could not persist idempotency key {key}: {e}")
+        future.set_result(record)
+        return idempotent_response(record, replayed=False)
+    
+    except BaseException as e:
+        if not future.done():
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody is waiting
+        if use_shared_store:
+            try:
+                await asyncio.to_thread(idempotency_collection.delete_one, {"_id": key, "status": "pending"})
+            except PyMongoError:
+                pass
+        raise
+    finally:
+        idempotency_inflight.pop(key, None)
+
+# ============================================================================
+# REALTIME SUBMISSION EVENTS (SERVER-SENT EVENTS)
+# ============================================================================
+
+def submission_event_summary(document):
+    """Compact payload for a "created" event"""
+    return {
+        "id": str(document["_id"]),
+        "name": document.get("name"),
+        "email": document.get("email"),
+        "status": document.get("status"),
+        "submitted_at": document.get("submitted_at"),
+        "attachments": len(document.get("uploaded_files") or [])
+    }
+
+def publish_submission_event(event_type, payload):
+    """Fan an event out to every subscriber queue of this worker (event loop only).
+
+    A subscriber that has fallen SSE_SUBSCRIBER_QUEUE_SIZE events behind
+    loses its oldest event rather than holding up everyone else.
+    """
+    # Change stream events also carry other workers' writes
+    invalidate_submission_counts()
+    if event_type == "deleted":
+        forget_submission_manifests(payload["id"])
+    message = (event_type, payload)
+    for queue in submission_event_subscribers:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+def notify_submission_event(event_type, payload, watched=True):
+    """Publish a write made by this worker, unless the change stream will deliver it.
+
+    Writes to the archive are not watched (watched=False) and are always
+    published locally. Safe to call from worker threads (spool replay) as
+    well as the event loop.
+    """
+    invalidate_submission_counts()
+    if submission_events_loop is None or (watched and submission_events_source == "change_stream"):
+        return
+    submission_events_loop.call_soon_threadsafe(publish_submission_event, event_type, payload)
+
+def submission_event_from_change(change):
+    """Translate a change stream document into (event type, payload), or None"""
+    operation = change["operationType"]
+    submission_id = str(change["documentKey"]["_id"])
+    if operation == "insert":
+        return "created", submission_event_summary({"_id": submission_id, **change.get("fullDocument", {})})
+    if operation == "delete":
+        # The archival job copies a submission to the archive before removing it from the hot collection
+        if archive_collection is not None and archive_collection.find_one({"_id": change["documentKey"]["_id"]}, {"_id": 1}):
+            return "archived", {"id": submission_id}
+        return "deleted", {"id": submission_id}
+    if operation == "replace":
+        return "status_changed", {"id": submission_id, "status": change.get("fullDocument", {}).get("status")}
+    updated_fields = change.get("updateDescription", {}).get("updatedFields", {})
+    if "status" in updated_fields:
+        return "status_changed", {"id": submission_id, "status": updated_fields["status"]}
+    return None
+
+def watch_submission_changes(loop):
+    """Blocking change stream reader; runs in a worker thread until stopped or failed.
+
+    One stream per worker serves every subscriber, so idle admin tabs cost
+    a queue each and put no load on MongoDB.
+    """
+    global submission_events_source, submission_change_stream_resume_token
+    pipeline = [
+        {"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}},
+        {"$project": {
+            "operationType": 1,
+            "documentKey": 1,
+            "fullDocument.name": 1,
+            "fullDocument.email": 1,
+            "fullDocument.status": 1,
+            "fullDocument.submitted_at": 1,
+            "fullDocument.uploaded_files.saved_name": 1,
+            "updateDescription.updatedFields.status": 1
+        }}
+    ]
+    with collection.watch(pipeline, resume_after=submission_change_stream_resume_token, max_await_time_ms=1000) as stream:
+        submission_events_source = "change_stream"
+        logger.info("📡 Submission events are driven by a MongoDB change stream")
+        try:
+            while not submission_change_stream_stop.is_set():
+                change = stream.try_next()
+                submission_change_stream_resume_token = stream.resume_token
+                if change is None:
+                    continue
+                event = submission_event_from_change(change)
+                if event:
+                    loop.call_soon_threadsafe(publish_submission_event, *event)
+        finally:
+            submission_events_source = "local"
+
+async def submission_change_stream_loop():
+    """Keep a change stream open while MongoDB is connected, falling back to local pub/sub"""
+    global submission_events_source, submission_change_stream_resume_token
+    loop = asyncio.get_running_loop()
+    delay = MONGODB_RECONNECT_MIN_DELAY
+    while True:
+        try:
+            if not is_db_connected or collection is None:
+                await asyncio.sleep(MONGODB_SUPERVISOR_INTERVAL)
+                continue
+            await asyncio.to_thread(watch_submission_changes, loop)
+            delay = MONGODB_RECONNECT_MIN_DELAY
+        except asyncio.CancelledError:
+            raise
+        except (OperationFailure, NotImplementedError) as e:
+            submission_events_source = "local"
+            if isinstance(e, NotImplementedError) or e.code == 40573:
+                # Standalone servers have no change streams; this worker's writes are still published locally
+                logger.info(f"Change streams unavailable, using in-process submission events: {e}")
+                return
+            # Most likely the resume token fell off the oplog; start a fresh stream
+            logger.warning(f"⚠️ Submission change stream failed, restarting without resume token: {e}")
+            submission_change_stream_resume_token = None
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MONGODB_RECONNECT_MAX_DELAY)
+        except Exception as e:
+            logger.warning(f"⚠️ Submission change stream interrupted, retrying in {delay:.0f}s: {e}")
+            submission_events_source = "local"
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MONGODB_RECONNECT_MAX_DELAY)
+
+async def submission_event_stream(request: Request, queue):
+    """SSE frames for one subscriber, with comment heartbeats to keep proxies from timing out"""
+    try:
+        yield f"retry: 5000\nevent: ready\ndata: {orjson.dumps({'source': submission_events_source}).decode()}\n\n"
+        while True:
+            try:
+                event_type, payload = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+                continue
+            data = orjson.dumps(payload, default=bson_default).decode()
+            yield f"event: {event_type}\ndata: {data}\n\n"
+    finally:
+        submission_event_subscribers.discard(queue)
+
+@app.get("/api/submissions/events")
+async def stream_submission_events(request: Request):
+    """Server-Sent Events feed of submission created, status_changed, deleted and archived events"""
+    queue = asyncio.Queue(maxsize=SSE_SUBSCRIBER_QUEUE_SIZE)
+    submission_event_subscribers.add(queue)
+    return StreamingResponse(
+        submission_event_stream(request, queue),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ============================================================================
+# SUBMISSION SEARCH
+# ============================================================================
+
+def normalize_email(email):
+    """Lower-cased, trimmed email used for prefix search"""
+    return (email or "").strip().lower()
+
+def phone_digits(phone):
+    """Digits of a phone number, so +974 1234-5678 is found by searching 9741234"""
+    return re.sub(r"\D", "", phone or "")
+
+def classify_search_query(q, mode="auto"):
+    """Pick the search strategy: ("email" | "phone" | "text", normalized value)"""
+    q = q.strip()
+    if mode == "auto":
+        if "@" in q and " " not in q:
+            mode = "email"
+        elif re.fullmatch(r"[\d\s()+\-.]+", q) and len(phone_digits(q)) >= 3:
+            mode = "phone"
+        else:
+            mode = "text"
+    if mode == "email":
+        return mode, normalize_email(q)
+    if mode == "phone":
+        return mode, phone_digits(q)
+    return "text", q
+
+def encode_search_cursor(score, submission_id):
+    """Opaque keyset cursor for the last result of a page"""
+    return base64.urlsafe_b64encode(orjson.dumps([score, str(submission_id)])).decode().rstrip("=")
+
+def decode_search_cursor(cursor):
+    """(score, ObjectId) from encode_search_cursor; raises ValueError if malformed"""
+    try:
+        score, submission_id = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return score, ObjectId(submission_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+def build_search_pipeline(mode, value, status, after, limit, include_archived=False):
+    """Aggregation for one page of results, ordered by relevance (text) or recency (prefix).
+
+    Pages continue after the (score, _id) of the previous page's last result
+    instead of skipping, so deep pages cost the same as the first one.
+    With include_archived the archive collection is searched as well.
+    """
+    projection = {"name": 1, "email": 1, "phone": 1, "message": 1, "status": 1, "submitted_at": 1, "archived": 1}
+    if mode == "text":
+        match = {"$text": {"$search": value}}
+        if status:
+            match["status"] = status
+        pipeline = [{"$match": match}, {"$addFields": {"score": {"$meta": "textScore"}}}]
+        if include_archived:
+            # $text must lead its own pipeline, so the archive is scored separately
+            pipeline.append({"$unionWith": {
+                "coll": ARCHIVE_COLLECTION_NAME,
+                "pipeline": [
+                    {"$match": match},
+                    {"$addFields": {"score": {"$meta": "textScore"}, "archived": True}}
+                ]
+            }})
+        if after:
+            score, last_id = after
+            pipeline.append({"$match": {"$or": [
+                {"score": {"$lt": score}},
+                {"score": score, "_id": {"$lt": last_id}}
+            ]}})
+        return pipeline + [
+            {"$sort": {"score": -1, "_id": -1}},
+            {"$limit": limit + 1},
+            {"$project": {**projection, "score": 1}}
+        ]
+    
+    # Anchored regexes on the normalized fields are index range scans
+    field = "email_normalized" if mode == "email" else "phone_digits"
+    match = {field: {"$regex": f"^{re.escape(value)}"}}
+    if status:
+        match["status"] = status
+    if after:
+        match["_id"] = {"$lt": after[1]}
+    return submission_tiers_pipeline(match, include_archived) + [
+        {"$sort": {"_id": -1}},
+        {"$limit": limit + 1},
+        {"$project": projection}
+    ]
+
+def search_highlight_pattern(mode, value):
+    """Regex matching what a query hit in the original (unnormalized) fields"""
+    if mode == "phone":
+        # Allow the separators that phone_digits stripped
+        return re.compile(r"\D*".join(re.escape(digit) for digit in value))
+    if mode == "email":
+        return re.compile(re.escape(value), re.IGNORECASE)
+    terms = [term.strip('"') for term in value.split() if not term.startswith("-")]
+    terms = sorted({term for term in terms if term}, key=len, reverse=True)
+    if not terms:
+        return None
+    # Text search stems words, so highlight whole words that start with a term
+    return re.compile(r"\b(?:" + "|".join(re.escape(term) for term in terms) + r")\w*", re.IGNORECASE)
+
+def highlight_text(text, pattern, radius=None):
+    """HTML-escaped text with <mark> around matches, trimmed to a snippet when radius is set"""
+    if not text or pattern is None:
+        return None
+    first = pattern.search(text)
+    if not first:
+        return None
+    prefix = suffix = ""
+    if radius is not None:
+        start = max(0, first.start() - radius)
+        end = min(len(text), first.end() + radius)
+        prefix = "…" if start > 0 else ""
+        suffix = "…" if end < len(text) else ""
+        text = text[start:end]
+    
+    parts = []
+    last = 0
+    for match in pattern.finditer(text):
+        parts.append(html.escape(text[last:match.start()]))
+        parts.append(f"<mark>{html.escape(match.group(0))}</mark>")
+        last = match.end()
+    parts.append(html.escape(text[last:]))
+    return prefix + "".join(parts) + suffix
+
+@app.get("/api/submissions/search")
+async def search_submissions(
+    q: str,
+    status: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    mode: str = "auto",
+    include_archived: bool = False
+):
+    """Search submissions by keyword (weighted text index) or by email/phone prefix.
+
+    Results are relevance-sorted with keyset pagination: pass next_cursor
+    back as cursor to fetch the following page. Each result carries
+    highlights with matching fragments wrapped in <mark>; archived results
+    (include_archived=true) are flagged with archived: true.
+    """
+    try:
+        if not is_db_connected or collection is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Database connection not available"
+            )
+        if not q.strip():
+            raise HTTPException(
+                status_code=400,
+                detail="Search query is required"
+            )
+        if mode not in ("auto", "text", "email", "phone"):
+            raise HTTPException(
+                status_code=400,
+                detail="mode must be one of: auto, text, email, phone"
+            )
+        
+        search_mode, value = classify_search_query(q, mode)
+        if not value:
+            raise HTTPException(
+                status_code=400,
+                detail="Search query has no searchable characters"
+            )
+        try:
+            after = decode_search_cursor(cursor) if cursor else None
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid cursor"
+            )
+        
+        limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+        results = list(collection.aggregate(build_search_pipeline(search_mode, value, status, after, limit, include_archived)))
+        has_more = len(results) > limit
+        results = results[:limit]
+        
+        pattern = search_highlight_pattern(search_mode, value)
+        for result in results:
+            highlights = {
+                field: highlight_text(result.get(field), pattern)
+                for field in ("name", "email", "phone")
+            }
+            highlights["message"] = highlight_text(result.get("message"), pattern, SEARCH_SNIPPET_RADIUS)
+            result["highlights"] = {field: snippet for field, snippet in highlights.items() if snippet}
+        
+        next_cursor = None
+        if has_more:
+            next_cursor = encode_search_cursor(results[-1].get("score"), results[-1]["_id"])
+        
+        return MongoJSONResponse({
+            "success": True,
+            "query": q,
+            "mode": search_mode,
+            "results": results,
+            "returned_count": len(results),
+            "has_more": has_more,
+            "next_cursor": next_cursor
+        })
         
     except HTTPException:
         raise
+    except PyMongoError as e:
+        logger.error(f"MongoDB error during search: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Database error occurred while searching submissions"
+        )
     except Exception as e:
-        logger.error(f"Error downloading file: {e}")
+        logger.error(f"Unexpected error during search: {e}")
         raise HTTPException(
             status_code=500,
-            detail="Failed to download file"
+            detail="An unexpected error occurred"
         )
 
 # ============================================================================
@@ -743,16 +3599,15 @@ async def send_notification_email(form_data, uploaded_files=None):
             """
             
             for file_info in uploaded_files:
-                file_path = UPLOAD_DIR / file_info["saved_name"]
-                if file_path.exists():
+                storage_key = attachment_storage_key(file_info)
+                if await asyncio.to_thread(storage.exists, storage_key):
                     file_size = file_info["file_size"]
                     
                     # Only attach files smaller than 5MB to avoid email size limits
                     if file_size < 5 * 1024 * 1024:  # 5MB limit
                         try:
                             # Read file content for attachment
-                            with open(file_path, "rb") as f:
-                                file_content = f.read()
+                            file_content = await asyncio.to_thread(read_stored_file, storage_key)
                             
                             # Encode file content as base64 for Resend
                             file_content_b64 = base64.b64encode(file_content).decode('utf-8')
@@ -1050,7 +3905,7 @@ async def send_notification_email(form_data, uploaded_files=None):
         elif uploaded_files:
             logger.info(f"📎 {len(uploaded_files)} files uploaded but not attached (too large or error)")
         
-        email_response = resend.Emails.send(params)
+        email_response = await asyncio.to_thread(resend.Emails.send, params)
         logger.info(f"✅ Dual notification email sent successfully!")
         logger.info(f"   - Admin Gmail: {ADMIN_EMAIL}")
         logger.info(f"   - Company Outlook: {COMPANY_EMAIL}")
@@ -1072,8 +3927,16 @@ async def send_notification_email(form_data, uploaded_files=None):
         }
 
 @app.post("/api/send-reply")
-async def send_reply_email(request: Request):
-    """Send email reply directly to user from admin"""
+async def send_reply_email(
+    request: Request,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    """Send email reply directly to user from admin (retries with the same Idempotency-Key send once)"""
+    fingerprint = request_fingerprint(await request.body())
+    return await run_idempotent("send-reply", idempotency_key, fingerprint, lambda: process_send_reply(request))
+
+async def process_send_reply(request: Request):
+    """Validate the reply request and send it with Resend"""
     try:
         logger.info("Received email reply request")
         
@@ -1314,20 +4177,32 @@ async def submit_contact_form(
     email: str = Form(...),
     phone: str = Form(None),
     message: str = Form(...),
-    files: List[UploadFile] = File(None)
+    files: List[UploadFile] = File(None),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
-    """Handle contact form submissions with optional file uploads"""
+    """Handle contact form submissions with optional file uploads (retries with the same Idempotency-Key are stored once)"""
+    fingerprint = request_fingerprint({
+        "name": name,
+        "email": email,
+        "phone": phone,
+        "message": message,
+        "files": [[file.filename, file.size] for file in files or []]
+    })
+    return await run_idempotent(
+        "contact",
+        idempotency_key,
+        fingerprint,
+        lambda: process_contact_submission(name, email, phone, message, files)
+    )
+
+async def process_contact_submission(name, email, phone, message, files):
+    """Validate, store and notify about a single contact form submission"""
+    uploaded_files = []
+    uncounted_blobs = []
+    stored = False
     try:
         logger.info("📝 Received contact form submission")
         
-        # Check if database connection is available
-        if not is_db_connected or collection is None:
-            logger.error("Database connection not available")
-            raise HTTPException(
-                status_code=503, 
-                detail="Database connection not available. Please check MongoDB configuration."
-            )
-        
         # Validate required fields
         if not name.strip():
             raise HTTPException(status_code=400, detail="Name is required")
@@ -1347,7 +4222,6 @@ async def submit_contact_form(
         logger.info(f"Form data: {form_data}")
         
         # Handle file uploads
-        uploaded_files = []
         if files and len(files) > 0:
             logger.info(f"Processing {len(files)} uploaded files")
             
@@ -1361,42 +4235,36 @@ async def submit_contact_form(
                             detail=f"File type '{file_extension}' not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
                         )
                     
-                    # Read file content
-                    file_content = await file.read()
-                    file_size = len(file_content)
-                    
-                    if file_size > MAX_FILE_SIZE:
-                        raise HTTPException(
-                            status_code=400,
-                            detail=f"File '{file.filename}' is too large. Maximum size: {MAX_FILE_SIZE // (1024*1024)}MB"
-                        )
+                    # Stream into the content-addressed store (hashing while writing)
+                    sha256, file_size, counted = await store_attachment_stream(file)
                     
                     if file_size == 0:
                         continue  # Skip empty files
                     
-                    # Generate unique filename
+                    # Generate unique filename (used in download URLs, mapped to the blob)
                     unique_id = uuid.uuid4().hex[:8]
                     safe_filename = f"{unique_id}_{file.filename}"
-                    file_path = UPLOAD_DIR / safe_filename
-                    
-                    # Save file to disk
-                    with open(file_path, "wb") as buffer:
-                        buffer.write(file_content)
                     
                     # Store file information
                     file_info = {
                         "original_name": file.filename,
                         "saved_name": safe_filename,
+                        "sha256": sha256,
                         "file_size": file_size,
                         "content_type": file.content_type or "application/octet-stream"
                     }
                     uploaded_files.append(file_info)
+                    if not counted:
+                        uncounted_blobs.append(sha256)
                     
                     logger.info(f"✅ Saved file: {file.filename} -> {safe_filename} ({format_file_size(file_size)})")
         
-        # Prepare submission data for database
+        # Prepare submission data for database (the _id doubles as the spool replay key)
         submission_data = {
+            "_id": ObjectId(),
             **form_data,
+            "email_normalized": normalize_email(form_data["email"]),
+            "phone_digits": phone_digits(form_data["phone"]),
             "uploaded_files": uploaded_files,
             "submitted_at": datetime.utcnow(),
             "status": "new"
@@ -1404,21 +4272,43 @@ async def submit_contact_form(
         
         logger.info(f"Submission data to be stored: {submission_data}")
         
-        # Store in MongoDB
-        try:
-            result = collection.insert_one(submission_data)
-            logger.info(f"✅ Successfully stored submission with ID: {result.inserted_id}")
-        except PyMongoError as e:
-            logger.error(f"MongoDB error: {e}")
-            # Clean up uploaded files if database save failed
-            for file_info in uploaded_files:
-                file_path = UPLOAD_DIR / file_info["saved_name"]
-                if file_path.exists():
-                    file_path.unlink()
-            raise HTTPException(
-                status_code=500,
-                detail="Database error occurred while storing submission"
-            )
+        # Store in MongoDB, falling back to the on-disk spool when it is down or slow
+        queued = True
+        if is_db_connected and collection is not None:
+            try:
+                if contact_batch_task is not None:
+                    # The batch writer updates the rollup once per flushed batch
+                    await insert_submission_batched(submission_data)
+                else:
+                    with pymongo.timeout(CONTACT_INSERT_TIMEOUT):
+                        collection.insert_one(submission_data)
+                    await asyncio.to_thread(update_submission_rollup, [(submission_data["submitted_at"], 1, {"new": 1})])
+                queued = False
+                logger.info(f"✅ Successfully stored submission with ID: {submission_data['_id']}")
+                notify_submission_event("created", submission_event_summary(submission_data))
+            except PyMongoError as e:
+                logger.warning(f"⚠️ MongoDB insert failed, spooling submission instead: {e}")
+        else:
+            logger.warning("⚠️ Database connection not available, spooling submission")
+        
+        if not queued and uncounted_blobs:
+            try:
+                retain_attachment_blobs([file_info for file_info in uploaded_files if file_info["sha256"] in uncounted_blobs])
+            except PyMongoError as e:
+                # Deletion re-checks submissions before removing a blob, so a missed increment is safe
+                logger.warning(f"⚠️ Failed to record attachment references: {e}")
+        
+        if queued:
+            try:
+                # Replay counts the references that could not be counted at upload time
+                spool_submission({**submission_data, "uncounted_blobs": uncounted_blobs} if uncounted_blobs else submission_data)
+            except OSError as e:
+                logger.error(f"Failed to spool submission: {e}")
+                raise HTTPException(
+                    status_code=500,
+                    detail="Database error occurred while storing submission"
+                )
+        stored = True
         
         # Send dual notification email (to both admin and company) with attachments
         try:
@@ -1436,7 +4326,8 @@ async def submit_contact_form(
         return {
             "success": True,
             "message": "Contact form submitted successfully",
-            "submission_id": str(result.inserted_id),
+            "submission_id": str(submission_data["_id"]),
+            "queued": queued,
             "timestamp": datetime.utcnow().isoformat(),
             "files_uploaded": len(uploaded_files),
             "notifications_sent_to": NOTIFICATION_EMAILS
@@ -1456,14 +4347,105 @@ async def submit_contact_form(
             status_code=500,
             detail="An unexpected error occurred while processing your submission"
         )
+    finally:
+        # Drop the blob references counted for a submission that was neither stored nor spooled
+        if not stored and uploaded_files and attachment_blob_collection is not None:
+            for file_info in uploaded_files:
+                if file_info["sha256"] in uncounted_blobs:
+                    continue
+                try:
+                    await asyncio.to_thread(release_attachment_blob, file_info["sha256"])
+                except Exception as e:
+                    logger.warning(f"⚠️ Failed to release attachment blob {file_info['sha256']}: {e}")
+
+# Computed fields available to fields=, evaluated by the server inside the projection
+SUBMISSION_COMPUTED_FIELDS = {
+    "message_preview": {"$substrCP": [{"$ifNull": ["$message", ""]}, 0, MESSAGE_PREVIEW_LENGTH]},
+    "attachment_count": {"$size": {"$ifNull": ["$uploaded_files", []]}}
+}
+SUBMISSION_STORED_FIELDS = {"name", "email", "phone", "message", "status", "submitted_at", "updated_at", "uploaded_files"}
+SUBMISSION_SUMMARY_FIELDS = ["name", "email", "phone", "status", "submitted_at", "message_preview", "attachment_count"]
+
+def submission_projection(fields="summary"):
+    """Projection for fields= ("summary", "full" or a comma-separated list); None means the full document"""
+    if fields == "full":
+        return None
+    names = SUBMISSION_SUMMARY_FIELDS if fields == "summary" else [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SUBMISSION_STORED_FIELDS and name not in SUBMISSION_COMPUTED_FIELDS]
+    if unknown or not names:
+        raise ValueError(
+            f"Unknown fields: {', '.join(unknown) or '(none given)'}. "
+            f"Use summary, full or any of: {', '.join(sorted(SUBMISSION_STORED_FIELDS | set(SUBMISSION_COMPUTED_FIELDS)))}"
+        )
+    return {name: SUBMISSION_COMPUTED_FIELDS.get(name, 1) for name in names}
+
+def invalidate_submission_counts():
+    """Forget cached totals after a submission is created, deleted or changes status"""
+    submission_count_cache.clear()
+    invalidate_dashboard_cache()
+
+def count_submissions(query_filter, strategy, include_archived=False):
+    """(total, strategy used) for a listing filter; total is None for strategy "none".
+
+    "estimated" reads collection metadata and only applies without a filter,
+    so filtered requests fall back to "cached".
+    """
+    sources = [collection]
+    if include_archived and archive_collection is not None:
+        sources.append(archive_collection)
+    if strategy == "none":
+        return None, "none"
+    if strategy == "estimated":
+        if not query_filter:
+            return sum(source.estimated_document_count() for source in sources), "estimated"
+        strategy = "cached"
+    if strategy == "cached":
+        cache_key = json_util.dumps([query_filter, len(sources)], sort_keys=True)
+        cached = submission_count_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1], "cached"
+        total = sum(source.count_documents(query_filter) for source in sources)
+        submission_count_cache[cache_key] = (time.monotonic() + SUBMISSION_COUNT_CACHE_TTL, total)
+        return total, "cached"
+    return sum(source.count_documents(query_filter) for source in sources), "exact"
+
+def build_submission_filter(status=None, ids=None, date_from=None, date_to=None):
+    """Query for submissions by status, id list and submitted_at range; raises ValueError on bad input"""
+    query_filter = {}
+    if status:
+        query_filter["status"] = status
+    if ids:
+        try:
+            query_filter["_id"] = {"$in": [ObjectId(str(submission_id).strip()) for submission_id in ids]}
+        except Exception:
+            raise ValueError("ids must be valid submission ids")
+    try:
+        if date_from:
+            query_filter.setdefault("submitted_at", {})["$gte"] = datetime.fromisoformat(date_from)
+        if date_to:
+            query_filter.setdefault("submitted_at", {})["$lte"] = datetime.fromisoformat(date_to)
+    except (TypeError, ValueError):
+        raise ValueError("date_from and date_to must be ISO 8601 dates")
+    return query_filter
 
 @app.get("/api/submissions")
 async def get_submissions(
     limit: Optional[int] = 50,
     skip: Optional[int] = 0,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    fields: str = "summary",
+    count: str = "cached",
+    include_archived: bool = False
 ):
-    """Retrieve contact form submissions (for admin use)"""
+    """Retrieve contact form submissions (for admin use).
+
+    Returns a summary per submission by default (message preview and
+    attachment count instead of the full message and file list); use
+    fields=full or GET /api/submissions/{id} for complete documents.
+    count picks how total_count (and X-Total-Count) is computed: exact,
+    cached (SUBMISSION_COUNT_CACHE_TTL, cleared on writes), estimated or none.
+    include_archived merges the archive tier in, flagged with archived: true.
+    """
     try:
         if not is_db_connected or collection is None:
             raise HTTPException(
@@ -1471,35 +4453,354 @@ async def get_submissions(
                 detail="Database connection not available"
             )
         
+        try:
+            projection = submission_projection(fields)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=str(e)
+            )
+        if count not in ("exact", "cached", "estimated", "none"):
+            raise HTTPException(
+                status_code=400,
+                detail="count must be one of: exact, cached, estimated, none"
+            )
+        
         # Build query filter
         query_filter = {}
         if status:
             query_filter["status"] = status
         
-        # Get submissions with pagination
-        cursor = collection.find(query_filter).sort("submitted_at", -1).skip(skip).limit(limit)
-        submissions = []
-        
-        for doc in cursor:
-            # Convert ObjectId to string for JSON serialization
-            doc["_id"] = str(doc["_id"])
-            # Convert datetime to ISO string
-            if "submitted_at" in doc:
-                doc["submitted_at"] = doc["submitted_at"].isoformat()
-            submissions.append(doc)
+        # Get submissions with pagination (BSON types are encoded by MongoJSONResponse)
+        if include_archived:
+            pipeline = submission_tiers_pipeline(query_filter, True) + [
+                {"$sort": {"submitted_at": -1}},
+                {"$skip": skip},
+                {"$limit": limit}
+            ]
+            if projection is not None:
+                pipeline.append({"$project": {**projection, "archived": 1}})
+            submissions = list(collection.aggregate(pipeline))
+        else:
+            cursor = collection.find(query_filter, projection).sort("submitted_at", -1).skip(skip).limit(limit)
+            submissions = list(cursor)
         
         # Get total count
-        total_count = collection.count_documents(query_filter)
+        total_count, count_strategy = count_submissions(query_filter, count, include_archived)
+        
+        return MongoJSONResponse(
+            {
+                "success": True,
+                "submissions": submissions,
+                "total_count": total_count,
+                "count_strategy": count_strategy,
+                "returned_count": len(submissions),
+                "skip": skip,
+                "limit": limit
+            },
+            headers={"X-Total-Count": str(total_count)} if total_count is not None else None
+        )
+        
+    except HTTPException:
+        raise
+    except PyMongoError as e:
+        logger.error(f"MongoDB error: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Database error occurred while retrieving submissions"
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="An unexpected error occurred"
+        )
+
+def resolve_bulk_selection(data, projection):
+    """Submissions selected by a bulk request body ({"ids": [...]} or {"filter": {...}}).
+
+    Ids are looked up in the hot collection and then the archive; a filter
+    only selects archived submissions with "include_archived": true.
+    Archived documents are flagged archived: true. Returns (documents,
+    per-id results for ids that are invalid or missing, truncated), where
+    truncated is true if a filter matched more than BULK_MAX_SUBMISSIONS.
+    """
+    ids = data.get("ids")
+    selection_filter = data.get("filter")
+    if bool(ids) == bool(selection_filter):
+        raise HTTPException(
+            status_code=400,
+            detail="Provide either a non-empty ids list or a filter"
+        )
+    
+    results = []
+    if ids:
+        if not isinstance(ids, list) or len(ids) > BULK_MAX_SUBMISSIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"ids must be a list of at most {BULK_MAX_SUBMISSIONS} submission ids"
+            )
+        valid_ids = []
+        for submission_id in ids:
+            try:
+                valid_ids.append(ObjectId(str(submission_id)))
+            except Exception:
+                results.append({"id": submission_id, "result": "invalid_id"})
+        documents = list(collection.find({"_id": {"$in": valid_ids}}, projection))
+        found = {document["_id"] for document in documents}
+        if archive_collection is not None and len(found) < len(valid_ids):
+            missing = [submission_id for submission_id in valid_ids if submission_id not in found]
+            for document in archive_collection.find({"_id": {"$in": missing}}, projection):
+                documents.append({**document, "archived": True})
+                found.add(document["_id"])
+        results.extend({"id": str(submission_id), "result": "not_found"} for submission_id in valid_ids if submission_id not in found)
+        return documents, results, False
+    
+    if not isinstance(selection_filter, dict):
+        raise HTTPException(
+            status_code=400,
+            detail="filter must be an object with status, date_from and/or date_to"
+        )
+    try:
+        query_filter = build_submission_filter(
+            status=selection_filter.get("status"),
+            date_from=selection_filter.get("date_from"),
+            date_to=selection_filter.get("date_to")
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+    if not query_filter:
+        raise HTTPException(
+            status_code=400,
+            detail="filter must include status, date_from or date_to"
+        )
+    # Fetch one extra document to tell whether the filter matched more than the cap
+    documents = list(collection.find(query_filter, projection).limit(BULK_MAX_SUBMISSIONS + 1))
+    if selection_filter.get("include_archived") and archive_collection is not None and len(documents) <= BULK_MAX_SUBMISSIONS:
+        documents.extend(
+            {**document, "archived": True}
+            for document in archive_collection.find(query_filter, projection).limit(BULK_MAX_SUBMISSIONS + 1 - len(documents))
+        )
+    truncated = len(documents) > BULK_MAX_SUBMISSIONS
+    return documents[:BULK_MAX_SUBMISSIONS], results, truncated
+
+@app.post("/api/submissions/bulk/status")
+async def bulk_update_submission_status(request: Request):
+    """Set the status of many submissions.
+
+    Body: {"status": "...", "ids": [...]} or {"status": "...", "filter": {"status", "date_from", "date_to"}}.
+    Each submission is updated with find_one_and_update (in parallel), so
+    the rollup moves counts from the status it actually had, and one
+    deleted since the selection is reported as not_found.
+    """
+    try:
+        if not is_db_connected or collection is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Database connection not available"
+            )
+        
+        data = await request.json()
+        new_status = data.get("status")
+        if not new_status:
+            raise HTTPException(
+                status_code=400,
+                detail="Status field is required"
+            )
+        if not is_valid_status_name(new_status):
+            raise HTTPException(
+                status_code=400,
+                detail="Status must be 1-64 characters without '.' or '$'"
+            )
+        
+        documents, results, truncated = resolve_bulk_selection(data, {"_id": 1})
+        
+        def update_selected(document):
+            return submission_tier(document).find_one_and_update(
+                {"_id": document["_id"]},
+                {"$set": {"status": new_status, "updated_at": datetime.utcnow()}},
+                projection={"status": 1, "submitted_at": 1}
+            )
+        
+        def update_documents():
+            with ThreadPoolExecutor(max_workers=BULK_FILE_WORKERS) as pool:
+                return list(pool.map(update_selected, documents))
+        updated = []
+        missing = []
+        if documents:
+            for document, previous in zip(documents, await asyncio.to_thread(update_documents)):
+                if previous is None:
+                    missing.append({"id": str(document["_id"]), "result": "not_found"})
+                    continue
+                updated.append(previous)
+                notify_submission_event(
+                    "status_changed",
+                    {"id": str(document["_id"]), "status": new_status},
+                    watched=not document.get("archived")
+                )
+            update_submission_rollup([
+                (previous["submitted_at"], 0, {previous.get("status"): -1, new_status: 1})
+                for previous in updated if previous.get("status") != new_status
+            ])
+        modified_count = sum(1 for previous in updated if previous.get("status") != new_status)
+        
+        results = [{"id": str(previous["_id"]), "result": "updated"} for previous in updated] + missing + results
+        logger.info(f"Bulk status update to '{new_status}': {len(updated)} matched, {modified_count} modified")
+        
+        return {
+            "success": True,
+            "new_status": new_status,
+            "matched_count": len(updated),
+            "modified_count": modified_count,
+            "truncated": truncated,
+            "results": results
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in bulk status update: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to update submission statuses"
+        )
+
+@app.post("/api/submissions/bulk/delete")
+async def bulk_delete_submissions(request: Request):
+    """Delete many submissions, releasing their files in parallel.
+
+    Body: {"ids": [...]} or {"filter": {"status", "date_from", "date_to"}}.
+    Each submission is removed with find_one_and_delete, so only documents
+    this request actually deleted are counted, reported and have their
+    files released; one deleted concurrently elsewhere is reported as
+    not_found.
+    """
+    try:
+        if not is_db_connected or collection is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Database connection not available"
+            )
+        
+        data = await request.json()
+        projection = {"uploaded_files.saved_name": 1, "uploaded_files.sha256": 1, "status": 1, "submitted_at": 1}
+        documents, results, truncated = resolve_bulk_selection(data, {"_id": 1})
+        
+        def delete_selected(document):
+            deleted = submission_tier(document).find_one_and_delete({"_id": document["_id"]}, projection=projection)
+            if deleted is not None and document.get("archived"):
+                deleted["archived"] = True
+            return deleted
+        
+        def delete_documents():
+            with ThreadPoolExecutor(max_workers=BULK_FILE_WORKERS) as pool:
+                return list(pool.map(delete_selected, documents))
+        deleted_documents = []
+        if documents:
+            for document, deleted in zip(documents, await asyncio.to_thread(delete_documents)):
+                if deleted is None:
+                    results.append({"id": str(document["_id"]), "result": "not_found"})
+                else:
+                    deleted_documents.append(deleted)
+            update_submission_rollup([
+                (document["submitted_at"], -1, {document.get("status"): -1})
+                for document in deleted_documents
+            ])
+        
+        # Documents are gone, so blob reference checks see the final state
+        uploaded_files = []
+        for document in deleted_documents:
+            invalidate_attachment_manifest(document["_id"], document.get("uploaded_files", []))
+            notify_submission_event("deleted", {"id": str(document["_id"])}, watched=not document.get("archived"))
+            uploaded_files.extend(document.get("uploaded_files", []))
+        
+        def release_files():
+            with ThreadPoolExecutor(max_workers=BULK_FILE_WORKERS) as pool:
+                return list(pool.map(release_submission_file, uploaded_files))
+        if uploaded_files:
+            await asyncio.to_thread(release_files)
+        
+        results = [
+            {"id": str(document["_id"]), "result": "deleted", "files": len(document.get("uploaded_files", []))}
+            for document in deleted_documents
+        ] + results
+        logger.info(f"Bulk deleted {len(deleted_documents)} submissions and released {len(uploaded_files)} files")
         
         return {
             "success": True,
-            "submissions": submissions,
-            "total_count": total_count,
-            "returned_count": len(submissions),
-            "skip": skip,
-            "limit": limit
+            "deleted_count": len(deleted_documents),
+            "files_released": len(uploaded_files),
+            "truncated": truncated,
+            "results": results
         }
         
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in bulk delete: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to delete submissions"
+        )
+
+@app.post("/api/submissions/batch")
+async def batch_get_submissions(request: Request):
+    """Fetch a set of submissions by id with one $in query.
+
+    Body: {"ids": [...], "fields": "summary" | "full" | "name,email,..."}.
+    Results follow the requested order; unknown and invalid ids are listed
+    in missing_ids. Ids not in the hot collection are looked up in the
+    archive, and those submissions carry archived: true.
+    """
+    try:
+        if not is_db_connected or collection is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Database connection not available"
+            )
+        
+        data = await request.json()
+        ids = data.get("ids")
+        if not isinstance(ids, list) or not ids:
+            raise HTTPException(
+                status_code=400,
+                detail="ids must be a non-empty list of submission ids"
+            )
+        if len(ids) > BATCH_FETCH_MAX_IDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {BATCH_FETCH_MAX_IDS} ids can be fetched at once"
+            )
+        try:
+            projection = submission_projection(data.get("fields") or "summary")
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=str(e)
+            )
+        
+        # Valid ids are normalized (e.g. upper-case hex) so they match str(_id); invalid ones are reported as sent
+        requested = list(dict.fromkeys(
+            str(ObjectId(submission_id)) if ObjectId.is_valid(submission_id) else submission_id
+            for submission_id in map(str, ids)
+        ))
+        object_ids = [ObjectId(submission_id) for submission_id in requested if ObjectId.is_valid(submission_id)]
+        found = {str(document["_id"]): document for document in collection.find({"_id": {"$in": object_ids}}, projection)}
+        if archive_collection is not None and len(found) < len(object_ids):
+            missing = [object_id for object_id in object_ids if str(object_id) not in found]
+            for document in archive_collection.find({"_id": {"$in": missing}}, projection):
+                found[str(document["_id"])] = {**document, "archived": True}
+        
+        return MongoJSONResponse({
+            "success": True,
+            "submissions": [found[submission_id] for submission_id in requested if submission_id in found],
+            "missing_ids": [submission_id for submission_id in requested if submission_id not in found],
+            "returned_count": len(found)
+        })
+        
     except HTTPException:
         raise
     except PyMongoError as e:
@@ -1515,6 +4816,46 @@ async def get_submissions(
             detail="An unexpected error occurred"
         )
 
+@app.get("/api/submissions/{submission_id}")
+async def get_submission(submission_id: str):
+    """Retrieve one complete submission, including the full message and attachment list.
+
+    Archived submissions are found too and carry archived: true.
+    """
+    try:
+        if not is_db_connected or collection is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Database connection not available"
+            )
+        
+        submission = find_submission({"_id": ObjectId(submission_id)})
+        if not submission:
+            raise HTTPException(
+                status_code=404,
+                detail="Submission not found"
+            )
+        
+        return MongoJSONResponse({
+            "success": True,
+            "submission": submission
+        })
+        
+    except HTTPException:
+        raise
+    except PyMongoError as e:
+        logger.error(f"MongoDB error: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Database error occurred while retrieving submission"
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="An unexpected error occurred"
+        )
+
 @app.put("/api/submissions/{submission_id}/status")
 async def update_submission_status(submission_id: str, request: Request):
     """Update the status of a specific submission"""
@@ -1534,24 +4875,34 @@ async def update_submission_status(submission_id: str, request: Request):
                 status_code=400,
                 detail="Status field is required"
             )
+        if not is_valid_status_name(new_status):
+            raise HTTPException(
+                status_code=400,
+                detail="Status must be 1-64 characters without '.' or '$'"
+            )
         
-        # Update the submission
-        result = collection.update_one(
+        # Update the submission (the previous status moves its rollup count)
+        previous = update_submission(
             {"_id": ObjectId(submission_id)},
             {
                 "$set": {
                     "status": new_status,
                     "updated_at": datetime.utcnow()
                 }
-            }
+            },
+            projection={"status": 1, "submitted_at": 1}
         )
         
-        if result.matched_count == 0:
+        if previous is None:
             raise HTTPException(
                 status_code=404,
                 detail="Submission not found"
             )
         
+        notify_submission_event("status_changed", {"id": submission_id, "status": new_status}, watched=not previous.get("archived"))
+        if previous.get("status") != new_status:
+            update_submission_rollup([(previous["submitted_at"], 0, {previous.get("status"): -1, new_status: 1})])
+        
         return {
             "success": True,
             "message": "Submission status updated successfully",
@@ -1579,23 +4930,15 @@ async def delete_submission(submission_id: str):
             )
         
         # Get submission first to check for files
-        submission = collection.find_one({"_id": ObjectId(submission_id)})
+        submission = find_submission({"_id": ObjectId(submission_id)})
         if not submission:
             raise HTTPException(
                 status_code=404,
                 detail="Submission not found"
             )
         
-        # Delete associated files
-        uploaded_files = submission.get("uploaded_files", [])
-        for file_info in uploaded_files:
-            file_path = UPLOAD_DIR / file_info["saved_name"]
-            if file_path.exists():
-                file_path.unlink()
-                logger.info(f"Deleted file: {file_info['saved_name']}")
-        
-        # Delete submission from database
-        result = collection.delete_one({"_id": ObjectId(submission_id)})
+        # Delete submission from database (hot collection or archive)
+        result = submission_tier(submission).delete_one({"_id": ObjectId(submission_id)})
         
         if result.deleted_count == 0:
             raise HTTPException(
@@ -1603,6 +4946,15 @@ async def delete_submission(submission_id: str):
                 detail="Failed to delete submission"
             )
         
+        notify_submission_event("deleted", {"id": submission_id}, watched=not submission.get("archived"))
+        update_submission_rollup([(submission["submitted_at"], -1, {submission.get("status"): -1})])
+        
+        # Release associated files (shared blobs are only removed with their last reference)
+        uploaded_files = submission.get("uploaded_files", [])
+        invalidate_attachment_manifest(submission_id, uploaded_files)
+        for file_info in uploaded_files:
+            await asyncio.to_thread(release_submission_file, file_info)
+        
         logger.info(f"Deleted submission {submission_id} and {len(uploaded_files)} associated files")
         
         return {
@@ -1621,10 +4973,139 @@ async def delete_submission(submission_id: str):
             detail="An error occurred while deleting submission"
         )
 
+# ============================================================================
+# ADMIN DASHBOARD
+# ============================================================================
+
+def invalidate_dashboard_cache():
+    """Forget cached dashboard payloads after a write they include"""
+    global dashboard_cache_generation
+    dashboard_cache_generation += 1
+    dashboard_cache.clear()
+
+def dashboard_recent_submissions(limit):
+    """Newest submission summaries plus the cached total, for the dashboard"""
+    submissions = list(
+        collection.find({}, submission_projection("summary")).sort("submitted_at", -1).limit(limit)
+    )
+    total_count, _ = count_submissions({}, "cached")
+    return {"items": submissions, "total_count": total_count}
+
+@app.get("/api/admin/dashboard")
+async def get_admin_dashboard(limit: int = DASHBOARD_RECENT_SUBMISSIONS):
+    """Everything the admin home screen needs in one round-trip.
+
+    Combines /api/stats, the newest submissions, /api/website-images,
+    /api/website-images/categories and /api/admin/profile. The queries run
+    concurrently in worker threads and the payload is cached for
+    DASHBOARD_CACHE_TTL seconds, cleared by any submission, gallery or
+    profile write. A failing section is returned as null and listed in errors.
+    """
+    try:
+        if not is_db_connected or collection is None or gallery_collection is None or admin_collection is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Database connection not available"
+            )
+        
+        limit = max(1, min(limit, 100))
+        cached = dashboard_cache.get(limit)
+        if cached and cached[0] > time.monotonic():
+            return MongoJSONResponse({**cached[1], "cached": True})
+        
+        generation = dashboard_cache_generation
+        sections = {
+            "stats": submission_stats_summary,
+            "submissions": lambda: dashboard_recent_submissions(limit),
+            "images": load_website_images,
+            "categories": lambda: sorted(gallery_collection.distinct("category")),
+            "gallery_version": get_gallery_version,
+            "admin": admin_profile_data
+        }
+        results = await asyncio.gather(
+            *(asyncio.to_thread(load) for load in sections.values()),
+            return_exceptions=True
+        )
+        
+        payload = {"success": True, "generated_at": datetime.utcnow()}
+        errors = {}
+        for name, result in zip(sections, results):
+            if isinstance(result, Exception):
+                logger.error(f"Dashboard section '{name}' failed: {result}")
+                errors[name] = str(result)
+                result = None
+            payload[name] = result
+        payload["errors"] = errors
+        
+        # Partial payloads are not cached so the next load retries the failed section,
+        # nor are payloads that a write may have outdated while they were built
+        if not errors and generation == dashboard_cache_generation:
+            dashboard_cache[limit] = (time.monotonic() + DASHBOARD_CACHE_TTL, payload)
+        return MongoJSONResponse({**payload, "cached": False})
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error building admin dashboard: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to load dashboard"
+        )
+
 # ============================================================================
 # GALLERY MANAGEMENT ENDPOINTS
 # ============================================================================
 
+def gallery_slot_payload(doc):
+    """A gallery slot in the format expected by admin panels"""
+    updated_at = doc.get("updated_at")
+    return {
+        "id": doc.get("id"),
+        "name": doc.get("name", "Unknown"),
+        "description": doc.get("description", "No description"),
+        "current_url": doc.get("current_url", ""),
+        "default_url": doc.get("default_url", ""),
+        "locations": doc.get("locations", []),
+        "recommended_size": doc.get("recommended_size", ""),
+        "category": doc.get("category", "other"),
+        "updated_at": updated_at.isoformat() if updated_at else "",
+        "version": doc.get("version", 0)
+    }
+
+def load_website_images():
+    """All gallery slots keyed by image id, in the format expected by admin panels"""
+    logger.info("Fetching images from gallery collection...")
+    
+    # Fetch all images from database
+    cursor = gallery_collection.find({})
+    images = {}
+    doc_count = 0
+    processed_count = 0
+    
+    for doc in cursor:
+        doc_count += 1
+        logger.info(f"Processing document {doc_count}: {doc.get('id', 'NO_ID')}")
+        
+        # Check if the document has 'id' field
+        image_id = doc.get("id")
+        if not image_id:
+            logger.warning(f"Document missing 'id' field, skipping: {list(doc.keys())}")
+            continue
+        
+        try:
+            # Convert MongoDB document to the expected format
+            images[image_id] = {**gallery_slot_payload(doc), "updated_at": datetime.utcnow().isoformat()}
+            processed_count += 1
+            logger.info(f"Successfully processed image: {image_id}")
+            
+        except Exception as doc_error:
+            logger.error(f"Error processing document {image_id}: {doc_error}")
+            continue
+    
+    logger.info(f"Processed {processed_count} out of {doc_count} documents")
+    logger.info(f"Final images dict has {len(images)} items")
+    return images
+
 @app.get("/api/website-images")
 async def get_website_images():
     """Get all website images in format expected by admin panels"""
@@ -1637,51 +5118,13 @@ async def get_website_images():
                 "total_count": 0
             }
         
-        logger.info("Fetching images from gallery collection...")
-        
-        # Fetch all images from database
-        cursor = gallery_collection.find({})
-        images = {}
-        doc_count = 0
-        processed_count = 0
-        
-        for doc in cursor:
-            doc_count += 1
-            logger.info(f"Processing document {doc_count}: {doc.get('id', 'NO_ID')}")
-            
-            # Check if the document has 'id' field
-            image_id = doc.get("id")
-            if not image_id:
-                logger.warning(f"Document missing 'id' field, skipping: {list(doc.keys())}")
-                continue
-            
-            try:
-                # Convert MongoDB document to the expected format
-                images[image_id] = {
-                    "id": image_id,
-                    "name": doc.get("name", "Unknown"),
-                    "description": doc.get("description", "No description"),
-                    "current_url": doc.get("current_url", ""),
-                    "default_url": doc.get("default_url", ""),
-                    "locations": doc.get("locations", []),
-                    "recommended_size": doc.get("recommended_size", ""),
-                    "category": doc.get("category", "other"),
-                    "updated_at": datetime.utcnow().isoformat()
-                }
-                processed_count += 1
-                logger.info(f"Successfully processed image: {image_id}")
-                
-            except Exception as doc_error:
-                logger.error(f"Error processing document {image_id}: {doc_error}")
-                continue
-        
-        logger.info(f"Processed {processed_count} out of {doc_count} documents")
-        logger.info(f"Final images dict has {len(images)} items")
+        images = load_website_images()
         
         return {
             "success": True,
             "images": images,
-            "total_count": len(images)
+            "total_count": len(images),
+            "gallery_version": get_gallery_version()
         }
         
     except Exception as e:
@@ -1723,6 +5166,100 @@ async def get_image_categories():
             "categories": ["hero", "about", "services", "portfolio", "contact", "team", "branding", "testimonials", "trading"]
         }
 
+@app.get("/api/website-images/changes")
+async def get_website_image_changes(since: Optional[str] = None):
+    """Gallery slots changed and deleted since a gallery version or ISO 8601 timestamp.
+
+    Pass the returned gallery_version as since on the next call to sync
+    incrementally; it only covers finished writes, so a slot may be sent
+    twice but never skipped. Without since every slot is returned. Deleted
+    slots are listed by id from their tombstones.
+    """
+    try:
+        if not is_db_connected or gallery_collection is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Database connection not available"
+            )
+        
+        gallery_version = get_gallery_version()
+        if since:
+            try:
+                slot_filter, tombstone_filter = parse_gallery_since(since.strip())
+            except ValueError:
+                raise HTTPException(
+                    status_code=400,
+                    detail="since must be a gallery version or an ISO 8601 timestamp"
+                )
+        else:
+            slot_filter, tombstone_filter = {}, None
+        
+        changed = {
+            doc["id"]: gallery_slot_payload(doc)
+            for doc in gallery_collection.find(slot_filter, {"_id": 0}) if doc.get("id")
+        }
+        deleted = []
+        if tombstone_filter is not None and gallery_tombstone_collection is not None:
+            deleted = [
+                tombstone["_id"]
+                for tombstone in gallery_tombstone_collection.find(tombstone_filter, {"_id": 1})
+                if tombstone["_id"] not in changed
+            ]
+        
+        return {
+            "success": True,
+            "since": since,
+            "full": since is None,
+            "gallery_version": gallery_version,
+            "changed": changed,
+            "deleted": deleted,
+            "changed_count": len(changed),
+            "deleted_count": len(deleted)
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching website image changes: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to fetch website image changes"
+        )
+
+def replace_gallery_image(existing_image, relative_path):
+    """Point a gallery slot at a newly stored image and drop its previous custom file"""
+    image_id = existing_image["id"]
+    
+    # Update database with new URL
+    new_url = f"/images/{relative_path}"
+    with gallery_write() as version:
+        update_result = gallery_collection.update_one(
+            {"id": image_id},
+            {
+                "$set": {
+                    "current_url": new_url,
+                    "updated_at": datetime.utcnow(),
+                    "version": version
+                }
+            }
+        )
+    
+    if update_result.modified_count == 0:
+        # Clean up uploaded file if database update failed
+        storage.delete(image_storage_key(relative_path))
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to update image in database"
+        )
+    
+    # Remove the previous custom image for this slot
+    previous_path = image_relative_path_from_url(existing_image.get("current_url", ""))
+    if previous_path and previous_path != relative_path:
+        if storage.delete(image_storage_key(previous_path)):
+            logger.info(f"Deleted previous image for {image_id}: {previous_path}")
+    
+    return new_url
+
 @app.post("/api/website-images/{image_id}/upload")
 async def upload_image(image_id: str, file: UploadFile = File(...)):
     """Upload a new image for a specific image slot"""
@@ -1750,7 +5287,7 @@ async def upload_image(image_id: str, file: UploadFile = File(...)):
         
         # Check file extension
         file_extension = Path(file.filename).suffix.lower()
-        if file_extension not in {".jpg", ".jpeg", ".png", ".gif", ".webp"}:
+        if file_extension not in GALLERY_IMAGE_EXTENSIONS:
             raise HTTPException(
                 status_code=400,
                 detail=f"File type not allowed. Allowed types: .jpg, .jpeg, .png, .gif, .webp"
@@ -1764,35 +5301,15 @@ async def upload_image(image_id: str, file: UploadFile = File(...)):
                 detail=f"File too large. Maximum size: {MAX_FILE_SIZE // (1024*1024)}MB"
             )
         
-        # Generate unique filename
+        # Generate unique filename in the sharded images/ layout
         unique_filename = f"{image_id}_{uuid.uuid4().hex[:8]}{file_extension}"
-        file_path = IMAGES_DIR / unique_filename
+        relative_path = sharded_relative_path(unique_filename)
+        image_key = image_storage_key(relative_path)
         
         # Save file
-        with open(file_path, "wb") as buffer:
-            buffer.write(file_content)
-        
-        # Update database with new URL
-        new_url = f"/images/{unique_filename}"
-        update_result = gallery_collection.update_one(
-            {"id": image_id},
-            {
-                "$set": {
-                    "current_url": new_url,
-                    "updated_at": datetime.utcnow()
-                }
-            }
-        )
-        
-        if update_result.modified_count == 0:
-            # Clean up uploaded file if database update failed
-            if file_path.exists():
-                file_path.unlink()
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to update image in database"
-            )
+        await asyncio.to_thread(storage.put_stream, image_key, io.BytesIO(file_content))
         
+        new_url = await asyncio.to_thread(replace_gallery_image, existing_image, relative_path)
         logger.info(f"Successfully uploaded image for {image_id}: {unique_filename}")
         
         return {
@@ -1834,16 +5351,18 @@ async def update_image_metadata(image_id: str, request: Request):
             )
         
         # Update image metadata
-        update_result = gallery_collection.update_one(
-            {"id": image_id},
-            {
-                "$set": {
-                    "name": name,
-                    "description": description,
-                    "updated_at": datetime.utcnow()
+        with gallery_write() as version:
+            update_result = gallery_collection.update_one(
+                {"id": image_id},
+                {
+                    "$set": {
+                        "name": name,
+                        "description": description,
+                        "updated_at": datetime.utcnow(),
+                        "version": version
+                    }
                 }
-            }
-        )
+            )
         
         if update_result.matched_count == 0:
             raise HTTPException(
@@ -1887,24 +5406,23 @@ async def reset_image_to_default(image_id: str):
             )
         
         # Delete current uploaded file if it exists
-        current_url = image_doc.get("current_url", "")
-        if current_url.startswith("/images/"):
-            file_path = IMAGES_DIR / current_url.replace("/images/", "")
-            if file_path.exists():
-                file_path.unlink()
-                logger.info(f"Deleted uploaded file: {file_path}")
+        current_path = image_relative_path_from_url(image_doc.get("current_url", ""))
+        if current_path and await asyncio.to_thread(storage.delete, image_storage_key(current_path)):
+            logger.info(f"Deleted uploaded file: {current_path}")
         
         # Reset to default URL
         default_url = image_doc["default_url"]
-        update_result = gallery_collection.update_one(
-            {"id": image_id},
-            {
-                "$set": {
-                    "current_url": default_url,
-                    "updated_at": datetime.utcnow()
+        with gallery_write() as version:
+            update_result = gallery_collection.update_one(
+                {"id": image_id},
+                {
+                    "$set": {
+                        "current_url": default_url,
+                        "updated_at": datetime.utcnow(),
+                        "version": version
+                    }
                 }
-            }
-        )
+            )
         
         if update_result.modified_count == 0:
             raise HTTPException(
@@ -1924,98 +5442,553 @@ async def reset_image_to_default(image_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error resetting image: {e}")
+        logger.error(f"Error resetting image: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to reset image"
+        )
+
+@app.delete("/api/website-images/{image_id}")
+async def delete_image(image_id: str, delete_type: str = "image_only"):
+    """Delete image (either just the uploaded file or the entire configuration)"""
+    try:
+        if not is_db_connected or gallery_collection is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Database connection not available"
+            )
+        
+        # Validate delete_type
+        if delete_type not in ["image_only", "complete"]:
+            raise HTTPException(
+                status_code=400,
+                detail="delete_type must be either 'image_only' or 'complete'"
+            )
+        
+        # Get current image data
+        image_doc = gallery_collection.find_one({"id": image_id})
+        if not image_doc:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Image with ID '{image_id}' not found"
+            )
+        
+        # Delete uploaded file if it exists
+        current_path = image_relative_path_from_url(image_doc.get("current_url", ""))
+        if current_path and await asyncio.to_thread(storage.delete, image_storage_key(current_path)):
+            logger.info(f"Deleted uploaded file: {current_path}")
+        
+        if delete_type == "image_only":
+            # Reset to default URL
+            default_url = image_doc["default_url"]
+            with gallery_write() as version:
+                update_result = gallery_collection.update_one(
+                    {"id": image_id},
+                    {
+                        "$set": {
+                            "current_url": default_url,
+                            "updated_at": datetime.utcnow(),
+                            "version": version
+                        }
+                    }
+                )
+            
+            if update_result.modified_count == 0:
+                raise HTTPException(
+                    status_code=500,
+                    detail="Failed to reset image"
+                )
+            
+            logger.info(f"Deleted custom image for {image_id}, reset to default")
+            
+            return {
+                "success": True,
+                "message": "Custom image deleted, reset to default",
+                "image_id": image_id,
+                "default_url": default_url
+            }
+        
+        else:  # complete deletion
+            # Remove entire image configuration
+            with gallery_write() as version:
+                delete_result = gallery_collection.delete_one({"id": image_id})
+                if delete_result.deleted_count:
+                    # Leave a tombstone so delta sync clients learn about the deletion
+                    record_gallery_tombstones([image_id], version)
+            
+            if delete_result.deleted_count == 0:
+                raise HTTPException(
+                    status_code=500,
+                    detail="Failed to delete image configuration"
+                )
+            
+            logger.info(f"Completely deleted image configuration for {image_id}")
+            
+            return {
+                "success": True,
+                "message": "Image configuration deleted completely",
+                "image_id": image_id
+            }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting image: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to delete image"
+        )
+
+# ============================================================================
+# RESUMABLE CHUNKED UPLOADS
+# ============================================================================
+
+def upload_session_partial_path(upload_id):
+    """Local file that receives the chunks of an upload session"""
+    return UPLOAD_TMP_DIR / f"session_{upload_id}.part"
+
+def upload_session_chunk_path(upload_id):
+    """Private temp file that receives one chunk before it is appended"""
+    return UPLOAD_TMP_DIR / f"session_{upload_id}.{uuid.uuid4().hex}.chunk"
+
+def claim_upload_session(upload_id, query, state):
+    """Take the lease of a session for a chunk append or completion; returns the session or None.
+
+    The lease is a conditional update, so only one request per session holds
+    it across workers and nodes. A lease left behind by a crashed request
+    expires after UPLOAD_SESSION_LEASE_SECONDS.
+    """
+    now = datetime.utcnow()
+    return upload_session_collection.find_one_and_update(
+        {"_id": upload_id, **query, "$or": [{"lease": None}, {"lease.expires_at": {"$lt": now}}]},
+        {"$set": {"lease": {
+            "token": uuid.uuid4().hex,
+            "state": state,
+            "expires_at": now + timedelta(seconds=UPLOAD_SESSION_LEASE_SECONDS)
+        }}},
+        return_document=pymongo.ReturnDocument.AFTER
+    )
+
+def release_upload_session(session, updates=None):
+    """Drop a lease taken by claim_upload_session, applying updates; None if the lease was lost"""
+    update = {"$unset": {"lease": ""}}
+    if updates:
+        update["$set"] = updates
+    return upload_session_collection.find_one_and_update(
+        {"_id": session["_id"], "lease.token": session["lease"]["token"]},
+        update,
+        return_document=pymongo.ReturnDocument.AFTER
+    )
+
+def append_upload_chunk(partial_path, offset, chunk_path):
+    """Append a received chunk to the partial file if it holds at least offset bytes.
+
+    Returns None once the chunk is durable, or the number of bytes this node
+    actually has when the partial file is missing or short (the chunk is not
+    appended). Bytes past offset are left over from an append that was never
+    acknowledged and are cut off first.
+    """
+    size = partial_path.stat().st_size if partial_path.exists() else 0
+    if size < offset:
+        return size
+    with open(partial_path, "r+b" if partial_path.exists() else "wb") as buffer, open(chunk_path, "rb") as chunk:
+        buffer.truncate(offset)
+        buffer.seek(offset)
+        shutil.copyfileobj(chunk, buffer, UPLOAD_CHUNK_SIZE)
+        buffer.flush()
+        # The offset is only acknowledged once the bytes are durable
+        os.fsync(buffer.fileno())
+    return None
+
+def upload_offset_conflict(offset, detail):
+    """409 telling the client where to resume"""
+    return HTTPException(
+        status_code=409,
+        detail=detail,
+        headers={"Upload-Offset": str(offset)}
+    )
+
+def upload_session_status(session):
+    """Client-facing view of an upload session"""
+    return {
+        "upload_id": session["_id"],
+        "filename": session["filename"],
+        "size": session["size"],
+        "offset": session["offset"],
+        "complete": session["offset"] == session["size"],
+        "target": session["target"],
+        "expires_at": session["expires_at"]
+    }
+
+def get_upload_session(upload_id):
+    """Load an upload session or raise 404"""
+    if not is_db_connected or upload_session_collection is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Database connection not available"
+        )
+    session = upload_session_collection.find_one({"_id": upload_id})
+    if not session:
+        raise HTTPException(
+            status_code=404,
+            detail="Upload session not found or expired"
+        )
+    return session
+
+def hash_local_file(path):
+    """SHA-256 of a local file, read in UPLOAD_CHUNK_SIZE pieces"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(UPLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+@app.post("/api/uploads")
+async def create_upload_session(request: Request):
+    """Start a resumable upload for a gallery slot or an existing submission.
+
+    Body: {"filename", "size", "content_type"?, "sha256"?, "target": {"type": "gallery", "image_id"}
+    or {"type": "submission", "submission_id"}}. Chunks are then sent with
+    PUT /api/uploads/{upload_id}?offset=N and the file is attached by
+    POST /api/uploads/{upload_id}/complete.
+    """
+    try:
+        if not is_db_connected or upload_session_collection is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Database connection not available"
+            )
+        
+        data = await request.json()
+        filename = Path(str(data.get("filename") or "")).name
+        size = data.get("size")
+        target = data.get("target") or {}
+        if not filename or not isinstance(size, int) or size <= 0:
+            raise HTTPException(
+                status_code=400,
+                detail="filename and a positive integer size are required"
+            )
+        if size > RESUMABLE_UPLOAD_MAX_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File too large. Maximum size: {RESUMABLE_UPLOAD_MAX_SIZE // (1024*1024)}MB"
+            )
+        
+        file_extension = Path(filename).suffix.lower()
+        if target.get("type") == "gallery":
+            if file_extension not in GALLERY_IMAGE_EXTENSIONS:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"File type not allowed. Allowed types: .jpg, .jpeg, .png, .gif, .webp"
+                )
+            if gallery_collection.count_documents({"id": target.get("image_id")}, limit=1) == 0:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Image with ID '{target.get('image_id')}' not found"
+                )
+            target = {"type": "gallery", "image_id": target["image_id"]}
+        elif target.get("type") == "submission":
+            if file_extension not in ALLOWED_EXTENSIONS:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"File type '{file_extension}' not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
+                )
+            submission_id = ObjectId(target.get("submission_id"))
+            if collection.count_documents({"_id": submission_id}, limit=1) == 0:
+                raise HTTPException(
+                    status_code=404,
+                    detail="Submission not found"
+                )
+            target = {"type": "submission", "submission_id": str(submission_id)}
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail="target.type must be 'gallery' or 'submission'"
+            )
+        
+        now = datetime.utcnow()
+        session = {
+            "_id": uuid.uuid4().hex,
+            "filename": filename,
+            "content_type": data.get("content_type") or "application/octet-stream",
+            "size": size,
+            "offset": 0,
+            "sha256": (data.get("sha256") or "").lower() or None,
+            "target": target,
+            "created_at": now,
+            "updated_at": now,
+            "expires_at": now + timedelta(seconds=UPLOAD_SESSION_TTL)
+        }
+        upload_session_collection.insert_one(session)
+        logger.info(f"📤 Upload session {session['_id']} created for {filename} ({format_file_size(size)})")
+        
+        return {
+            "success": True,
+            **upload_session_status(session),
+            "chunk_size": UPLOAD_CHUNK_SIZE
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating upload session: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to create upload session"
+        )
+
+@app.api_route("/api/uploads/{upload_id}", methods=["GET", "HEAD"])
+async def get_upload_offset(upload_id: str):
+    """Current offset of an upload session (also in the Upload-Offset header)"""
+    try:
+        session = get_upload_session(upload_id)
+        return MongoJSONResponse(
+            {"success": True, **upload_session_status(session)},
+            headers={
+                "Upload-Offset": str(session["offset"]),
+                "Upload-Length": str(session["size"]),
+                "Cache-Control": "no-store"
+            }
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error reading upload session: {e}")
         raise HTTPException(
             status_code=500,
-            detail="Failed to reset image"
+            detail="Failed to read upload session"
         )
 
-@app.delete("/api/website-images/{image_id}")
-async def delete_image(image_id: str, delete_type: str = "image_only"):
-    """Delete image (either just the uploaded file or the entire configuration)"""
+@app.put("/api/uploads/{upload_id}")
+async def upload_chunk(
+    upload_id: str,
+    offset: int,
+    request: Request,
+    content_sha256: Optional[str] = Header(None)
+):
+    """Append the request body at offset; an optional Content-SHA256 header verifies the chunk.
+
+    The body is received into a private temp file first and only appended
+    to the partial file under the session lease, once the partial file is
+    confirmed to hold exactly offset bytes, so a retried or concurrent PUT
+    cannot overwrite bytes another request is acknowledging.
+    """
+    chunk_path = upload_session_chunk_path(upload_id)
     try:
-        if not is_db_connected or gallery_collection is None:
+        session = get_upload_session(upload_id)
+        if offset != session["offset"]:
+            raise upload_offset_conflict(session["offset"], f"Offset mismatch: upload is at byte {session['offset']}")
+        
+        declared_length = request.headers.get("content-length")
+        if declared_length and offset + int(declared_length) > session["size"]:
             raise HTTPException(
-                status_code=503,
-                detail="Database connection not available"
+                status_code=400,
+                detail="Chunk extends past the declared upload size"
             )
         
-        # Validate delete_type
-        if delete_type not in ["image_only", "complete"]:
+        # Receive the chunk into its own file, hashing on the way
+        digest = hashlib.sha256()
+        written = 0
+        with open(chunk_path, "wb") as buffer:
+            async for chunk in request.stream():
+                written += len(chunk)
+                if offset + written > session["size"]:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="Chunk extends past the declared upload size"
+                    )
+                buffer.write(chunk)
+                digest.update(chunk)
+        
+        if content_sha256 and content_sha256.lower() != digest.hexdigest():
             raise HTTPException(
                 status_code=400,
-                detail="delete_type must be either 'image_only' or 'complete'"
+                detail="Chunk checksum mismatch",
+                headers={"Upload-Offset": str(offset)}
             )
         
-        # Get current image data
-        image_doc = gallery_collection.find_one({"id": image_id})
-        if not image_doc:
+        session = claim_upload_session(upload_id, {"offset": offset}, "writing")
+        if session is None:
+            current = get_upload_session(upload_id)
+            raise upload_offset_conflict(current["offset"], "Upload session is busy or has moved to another offset")
+        
+        try:
+            actual_offset = await asyncio.to_thread(
+                append_upload_chunk, upload_session_partial_path(upload_id), offset, chunk_path
+            )
+        except BaseException:
+            release_upload_session(session)
+            raise
+        if actual_offset is not None:
+            # The received bytes are not on this node (another node or a cleaned tmp dir): resume from what is
+            release_upload_session(session, {"offset": actual_offset, "updated_at": datetime.utcnow()})
+            logger.warning(f"⚠️ Upload {upload_id} partial file holds {actual_offset} of {offset} bytes; client must resume")
+            raise upload_offset_conflict(actual_offset, f"Upload data is missing on the server: resume from byte {actual_offset}")
+        
+        now = datetime.utcnow()
+        new_offset = offset + written
+        updated = release_upload_session(
+            session,
+            {"offset": new_offset, "updated_at": now, "expires_at": now + timedelta(seconds=UPLOAD_SESSION_TTL)}
+        )
+        if updated is None:
             raise HTTPException(
-                status_code=404,
-                detail=f"Image with ID '{image_id}' not found"
+                status_code=409,
+                detail="Upload session was modified concurrently"
             )
         
-        # Delete uploaded file if it exists
-        current_url = image_doc.get("current_url", "")
-        if current_url.startswith("/images/"):
-            file_path = IMAGES_DIR / current_url.replace("/images/", "")
-            if file_path.exists():
-                file_path.unlink()
-                logger.info(f"Deleted uploaded file: {file_path}")
+        return MongoJSONResponse(
+            {"success": True, **upload_session_status(updated)},
+            headers={"Upload-Offset": str(new_offset)}
+        )
         
-        if delete_type == "image_only":
-            # Reset to default URL
-            default_url = image_doc["default_url"]
-            update_result = gallery_collection.update_one(
-                {"id": image_id},
-                {
-                    "$set": {
-                        "current_url": default_url,
-                        "updated_at": datetime.utcnow()
-                    }
-                }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error writing upload chunk: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to write upload chunk"
+        )
+    finally:
+        chunk_path.unlink(missing_ok=True)
+
+@app.post("/api/uploads/{upload_id}/complete")
+async def complete_upload_session(upload_id: str):
+    """Verify a fully uploaded file and attach it to its gallery slot or submission.
+
+    The session is leased as "completing" while the file is attached and
+    only deleted afterwards, so a completion that fails part-way can be
+    retried with the received bytes intact.
+    """
+    try:
+        session = get_upload_session(upload_id)
+        if session["offset"] != session["size"]:
+            raise upload_offset_conflict(
+                session["offset"],
+                f"Upload incomplete: {session['offset']} of {session['size']} bytes received"
             )
-            
-            if update_result.modified_count == 0:
-                raise HTTPException(
-                    status_code=500,
-                    detail="Failed to reset image"
-                )
-            
-            logger.info(f"Deleted custom image for {image_id}, reset to default")
-            
-            return {
-                "success": True,
-                "message": "Custom image deleted, reset to default",
-                "image_id": image_id,
-                "default_url": default_url
-            }
         
-        else:  # complete deletion
-            # Remove entire image configuration
-            delete_result = gallery_collection.delete_one({"id": image_id})
+        # Claim the session so a concurrent completion cannot attach the file twice
+        session = claim_upload_session(upload_id, {"offset": session["size"]}, "completing")
+        if session is None:
+            raise HTTPException(
+                status_code=409,
+                detail="Upload is already being completed"
+            )
+        
+        try:
+            partial_path = upload_session_partial_path(upload_id)
+            actual_size = partial_path.stat().st_size if partial_path.exists() else 0
+            if actual_size != session["size"]:
+                resume_offset = min(actual_size, session["size"])
+                release_upload_session(session, {"offset": resume_offset, "updated_at": datetime.utcnow()})
+                raise upload_offset_conflict(resume_offset, f"Upload data is missing on the server: resume from byte {resume_offset}")
             
-            if delete_result.deleted_count == 0:
+            sha256 = await asyncio.to_thread(hash_local_file, partial_path)
+            if session.get("sha256") and session["sha256"] != sha256:
+                upload_session_collection.delete_one({"_id": upload_id})
+                partial_path.unlink(missing_ok=True)
                 raise HTTPException(
-                    status_code=500,
-                    detail="Failed to delete image configuration"
+                    status_code=400,
+                    detail="File checksum mismatch; the upload has been discarded"
                 )
             
-            logger.info(f"Completely deleted image configuration for {image_id}")
-            
-            return {
-                "success": True,
-                "message": "Image configuration deleted completely",
-                "image_id": image_id
-            }
+            target = session["target"]
+            filename = session["filename"]
+            if target["type"] == "gallery":
+                existing_image = gallery_collection.find_one({"id": target["image_id"]})
+                if not existing_image:
+                    raise HTTPException(
+                        status_code=404,
+                        detail=f"Image with ID '{target['image_id']}' not found"
+                    )
+                unique_filename = f"{target['image_id']}_{uuid.uuid4().hex[:8]}{Path(filename).suffix.lower()}"
+                relative_path = sharded_relative_path(unique_filename)
+                # Copy rather than move: the partial file is kept until the slot points at the image
+                with open(partial_path, "rb") as source:
+                    await asyncio.to_thread(storage.put_stream, image_storage_key(relative_path), source)
+                new_url = await asyncio.to_thread(replace_gallery_image, existing_image, relative_path)
+                logger.info(f"Successfully uploaded image for {target['image_id']} via resumable upload: {unique_filename}")
+                result = {"image_id": target["image_id"], "new_url": new_url, "filename": unique_filename}
+            else:
+                _, counted = await asyncio.to_thread(acquire_attachment_blob, sha256, session["size"], partial_path, True)
+                if not counted:
+                    raise HTTPException(
+                        status_code=503,
+                        detail="Database connection not available"
+                    )
+                
+                # The saved name derives from the session, so a retried completion attaches nothing twice
+                file_info = {
+                    "original_name": filename,
+                    "saved_name": f"{upload_id[:8]}_{filename}",
+                    "sha256": sha256,
+                    "file_size": session["size"],
+                    "content_type": session["content_type"]
+                }
+                submission_id = ObjectId(target["submission_id"])
+                try:
+                    update_result = collection.update_one(
+                        {"_id": submission_id, "uploaded_files.saved_name": {"$ne": file_info["saved_name"]}},
+                        {"$push": {"uploaded_files": file_info}, "$set": {"updated_at": datetime.utcnow()}}
+                    )
+                except BaseException:
+                    await asyncio.to_thread(release_attachment_blob, sha256)
+                    raise
+                if update_result.matched_count == 0:
+                    # Already attached by an earlier attempt, or the submission is gone
+                    await asyncio.to_thread(release_attachment_blob, sha256)
+                    if collection.count_documents({"_id": submission_id}, limit=1) == 0:
+                        raise HTTPException(
+                            status_code=404,
+                            detail="Submission not found"
+                        )
+                logger.info(f"✅ Attached {filename} to submission {target['submission_id']} via resumable upload")
+                result = {"submission_id": target["submission_id"], "file": file_info}
+        except BaseException:
+            # Keep the session and its bytes so the client can retry the completion
+            if upload_session_collection.count_documents({"_id": upload_id}, limit=1):
+                release_upload_session(session)
+            raise
+        
+        upload_session_collection.delete_one({"_id": upload_id})
+        partial_path.unlink(missing_ok=True)
+        
+        return {
+            "success": True,
+            "upload_id": upload_id,
+            "sha256": sha256,
+            "size": session["size"],
+            **result
+        }
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error deleting image: {e}")
+        logger.error(f"Error completing upload session: {e}")
         raise HTTPException(
             status_code=500,
-            detail="Failed to delete image"
+            detail="Failed to complete upload"
+        )
+
+@app.delete("/api/uploads/{upload_id}")
+async def abort_upload_session(upload_id: str):
+    """Abandon an upload session and discard its received bytes"""
+    try:
+        get_upload_session(upload_id)
+        upload_session_collection.delete_one({"_id": upload_id})
+        upload_session_partial_path(upload_id).unlink(missing_ok=True)
+        return {"success": True, "message": "Upload aborted", "upload_id": upload_id}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error aborting upload session: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to abort upload"
         )
 
 # ============================================================================
@@ -2038,19 +6011,24 @@ async def debug_status():
             }
         }
         
-        # Test MongoDB connection
+        # MongoDB status from the background prober cache
+        mongodb_check = health_cache["checks"].get("mongodb")
         if mongodb_client and is_db_connected:
             try:
-                mongodb_client.admin.command('ping')
+                if mongodb_check is None:
+                    mongodb_check = await asyncio.to_thread(probe_mongodb)
+                if mongodb_check["status"] == "error":
+                    raise Exception(mongodb_check.get("error"))
                 status_info["mongodb_ping"] = "success"
+                status_info["health_checked_at"] = health_cache["checked_at"].isoformat() if health_cache["checked_at"] else None
                 
-                # Count documents in each collection
-                if gallery_collection:
-                    status_info["gallery_count"] = gallery_collection.count_documents({})
-                if admin_collection:
-                    status_info["admin_count"] = admin_collection.count_documents({})
-                if collection:
-                    status_info["submissions_count"] = collection.count_documents({})
+                # Collection metadata counts (no collection scan)
+                if gallery_collection is not None:
+                    status_info["gallery_count"] = gallery_collection.estimated_document_count()
+                if admin_collection is not None:
+                    status_info["admin_count"] = admin_collection.estimated_document_count()
+                if collection is not None:
+                    status_info["submissions_count"] = collection.estimated_document_count()
                     
             except Exception as e:
                 status_info["mongodb_ping"] = f"failed: {str(e)}"
@@ -2066,6 +6044,33 @@ async def debug_status():
             "timestamp": datetime.utcnow().isoformat()
         }
 
+@app.get("/api/debug/connection")
+async def debug_connection():
+    """MongoDB connection supervisor state and connection pool statistics"""
+    return MongoJSONResponse(get_db_connection_status())
+
+@app.get("/api/debug/spool")
+async def debug_spool():
+    """Show how many contact submissions are waiting in the write-ahead spool"""
+    return {
+        "pending_submissions": await asyncio.to_thread(spool_pending_count),
+        "spool_file": str(CONTACT_SPOOL_FILE),
+        "replay_in_progress": CONTACT_SPOOL_REPLAY_FILE.exists(),
+        "database_connected": is_db_connected,
+        "write_coalescing": {
+            "enabled": contact_batch_task is not None,
+            "window_ms": CONTACT_BATCH_WINDOW_MS,
+            "max_docs": CONTACT_BATCH_MAX_DOCS,
+            "queue_depth": contact_batch_queue.qsize() if contact_batch_queue is not None else 0,
+            **contact_batch_stats
+        }
+    }
+
+@app.get("/api/debug/admission")
+async def debug_admission():
+    """Show admission control queue depth, active requests and shed counts for this worker"""
+    return admission_stats
+
 @app.get("/api/debug/gallery-simple")
 async def debug_gallery_simple():
     """Simple gallery debug without complex processing"""
@@ -2087,16 +6092,14 @@ async def debug_gallery_simple():
         count = gallery_collection.count_documents({})
         
         # Get first document as sample
-        sample_doc = gallery_collection.find_one({})
-        if sample_doc:
-            sample_doc.pop("_id", None)
+        sample_doc = gallery_collection.find_one({}, {"_id": 0})
             
-        return {
+        return MongoJSONResponse({
             "gallery_collection_exists": True,
             "document_count": count,
             "sample_document": sample_doc,
             "collection_name": GALLERY_COLLECTION_NAME
-        }
+        })
         
     except Exception as e:
         return {
@@ -2203,74 +6206,43 @@ async def debug_gallery():
         if not is_db_connected or gallery_collection is None:
             return {"error": "Database not connected", "gallery_collection": gallery_collection is None}
         
-        # Get all images from database
-        cursor = gallery_collection.find({})
-        images = []
+        # Get all images from database (without MongoDB _id)
+        images = list(gallery_collection.find({}, {"_id": 0}))
         
-        for doc in cursor:
-            doc.pop("_id", None)  # Remove MongoDB _id
-            if "created_at" in doc and hasattr(doc["created_at"], 'isoformat'):
-                doc["created_at"] = doc["created_at"].isoformat()
-            if "updated_at" in doc and hasattr(doc["updated_at"], 'isoformat'):
-                doc["updated_at"] = doc["updated_at"].isoformat()
-            images.append(doc)
-        
-        return {
+        return MongoJSONResponse({
             "images_count": len(images),
             "images": images,
             "database_connected": is_db_connected,
             "collection_name": GALLERY_COLLECTION_NAME
-        }
+        })
         
     except Exception as e:
         return {"error": str(e)}
 
 @app.get("/api/debug/fix-missing-images")
-async def fix_missing_images():
+async def fix_missing_images(dry_run: bool = False):
     """Fix missing image files by resetting them to defaults"""
     try:
         if not is_db_connected or gallery_collection is None:
             return {"error": "Database not connected"}
         
-        fixed_count = 0
-        missing_files = []
-        
-        # Get all gallery images
-        cursor = gallery_collection.find({})
-        
-        for doc in cursor:
-            current_url = doc.get("current_url", "")
-            default_url = doc.get("default_url", "")
-            image_id = doc.get("id", "")
-            
-            # Check if current_url points to a local file that doesn't exist
-            if current_url.startswith("/images/"):
-                filename = current_url.replace("/images/", "")
-                file_path = IMAGES_DIR / filename
-                
-                if not file_path.exists():
-                    # Reset to default URL
-                    gallery_collection.update_one(
-                        {"_id": doc["_id"]},
-                        {
-                            "$set": {
-                                "current_url": default_url,
-                                "updated_at": datetime.utcnow()
-                            }
-                        }
-                    )
-                    fixed_count += 1
-                    missing_files.append({
-                        "image_id": image_id,
-                        "missing_file": filename,
-                        "reset_to": default_url
-                    })
+        result = await asyncio.to_thread(run_gallery_maintenance, dry_run)
+        missing_files = [
+            {
+                "image_id": repair["image_id"],
+                "missing_file": repair["missing_file"],
+                "reset_to": repair["to"]
+            }
+            for repair in result["repairs"]
+        ]
         
         return {
             "success": True,
-            "fixed_count": fixed_count,
+            "dry_run": dry_run,
+            "fixed_count": result["fixed_count"],
             "missing_files": missing_files,
-            "message": f"Reset {fixed_count} images with missing files to their default URLs"
+            "gallery_version": result["gallery_version"],
+            "message": f"Reset {result['fixed_count']} images with missing files to their default URLs"
         }
         
     except Exception as e:
@@ -2283,12 +6255,19 @@ async def reinitialize_gallery():
         if gallery_collection is None:
             return {"error": "Gallery collection not available"}
         
-        # Drop existing data
-        gallery_collection.delete_many({})
-        logger.info("Cleared existing gallery data")
-        
-        # Reinitialize
-        success = initialize_gallery_data()
+        with gallery_write() as version:
+            # Drop existing data
+            previous_ids = gallery_collection.distinct("id")
+            gallery_collection.delete_many({})
+            logger.info("Cleared existing gallery data")
+            
+            # Reinitialize, stamping every slot (and a tombstone for each slot that is gone)
+            success = initialize_gallery_data()
+            gallery_collection.update_many({}, {"$set": {"version": version}})
+            current_ids = set(gallery_collection.distinct("id"))
+            record_gallery_tombstones([image_id for image_id in previous_ids if image_id not in current_ids], version)
+            if gallery_tombstone_collection is not None:
+                gallery_tombstone_collection.delete_many({"_id": {"$in": list(current_ids)}})
         
         return {
             "success": success,
@@ -2305,33 +6284,16 @@ async def check_missing_files():
         if not is_db_connected or gallery_collection is None:
             return {"error": "Database not connected"}
         
-        missing_files = []
-        existing_files = []
-        
-        # Get all gallery images
-        cursor = gallery_collection.find({})
-        
-        for doc in cursor:
-            current_url = doc.get("current_url", "")
-            image_id = doc.get("id", "")
-            
-            if current_url.startswith("/images/"):
-                filename = current_url.replace("/images/", "")
-                file_path = IMAGES_DIR / filename
-                
-                if file_path.exists():
-                    existing_files.append({
-                        "image_id": image_id,
-                        "filename": filename,
-                        "size": file_path.stat().st_size
-                    })
-                else:
-                    missing_files.append({
-                        "image_id": image_id,
-                        "filename": filename,
-                        "current_url": current_url,
-                        "default_url": doc.get("default_url", "")
-                    })
+        repairs, existing_files = await asyncio.to_thread(plan_gallery_repairs)
+        missing_files = [
+            {
+                "image_id": repair["image_id"],
+                "filename": repair["missing_file"],
+                "current_url": repair["from"],
+                "default_url": repair["to"]
+            }
+            for repair in repairs
+        ]
         
         return {
             "missing_files_count": len(missing_files),
@@ -2343,40 +6305,327 @@ async def check_missing_files():
     except Exception as e:
         return {"error": str(e)}
 
-@app.get("/api/stats")
-async def get_submission_stats():
-    """Get statistics about form submissions"""
+@app.get("/api/debug/orphan-files")
+async def orphan_gc_status():
+    """Report from the last orphan file sweep"""
+    return MongoJSONResponse({
+        "enabled": ORPHAN_GC_ENABLED,
+        "interval_seconds": ORPHAN_GC_INTERVAL,
+        "grace_period_seconds": ORPHAN_GC_GRACE_PERIOD,
+        "quarantine_retention_seconds": ORPHAN_QUARANTINE_RETENTION,
+        "last_report": orphan_gc_last_report
+    })
+
+@app.post("/api/debug/orphan-files/sweep")
+async def run_orphan_sweep(dry_run: bool = True):
+    """Run the orphan file sweep now (dry run by default)"""
     try:
-        if not is_db_connected or collection is None:
+        if not is_db_connected or gallery_collection is None or collection is None:
+            return {"error": "Database not connected"}
+        
+        report = await asyncio.to_thread(sweep_orphan_files, dry_run)
+        return MongoJSONResponse({"success": True, **report})
+        
+    except Exception as e:
+        return {"error": str(e)}
+
+@app.get("/api/debug/archive")
+async def archive_status():
+    """Progress of the current or last archival run"""
+    try:
+        if not is_db_connected or app_metadata_collection is None:
+            return {"error": "Database not connected"}
+        
+        job = app_metadata_collection.find_one({"_id": "archive_job"}, {"_id": 0})
+        return MongoJSONResponse({
+            "enabled": ARCHIVE_ENABLED,
+            "interval_seconds": ARCHIVE_INTERVAL,
+            "archive_after_days": ARCHIVE_AFTER_DAYS,
+            "terminal_statuses": ARCHIVE_TERMINAL_STATUSES,
+            "terminal_after_days": ARCHIVE_TERMINAL_AFTER_DAYS,
+            "batch_size": ARCHIVE_BATCH_SIZE,
+            "running": archive_lock.locked(),
+            "job": job
+        })
+        
+    except Exception as e:
+        return {"error": str(e)}
+
+@app.post("/api/debug/archive/run")
+async def run_archive(dry_run: bool = True):
+    """Archive old and closed submissions now (dry run by default); resumes an interrupted run"""
+    try:
+        if not is_db_connected or collection is None or archive_collection is None:
+            return {"error": "Database not connected"}
+        
+        report = await asyncio.to_thread(archive_submissions, dry_run)
+        return MongoJSONResponse({"success": "skipped" not in report, **report})
+        
+    except Exception as e:
+        return {"error": str(e)}
+
+@app.post("/api/debug/stats/rebuild-rollup")
+async def rebuild_stats_rollup():
+    """Recompute the daily submission rollup from history"""
+    try:
+        if not is_db_connected or collection is None or submission_rollup_collection is None:
+            return {"error": "Database not connected"}
+        
+        report = await asyncio.to_thread(rebuild_submission_rollup)
+        return {"success": True, **report}
+        
+    except Exception as e:
+        return {"error": str(e)}
+
+@app.post("/api/debug/migrate-storage-layout")
+async def migrate_storage_layout(dry_run: bool = True):
+    """Move flat images/ and uploads/ files into the sharded layout (dry run by default)"""
+    try:
+        if not is_db_connected or gallery_collection is None or collection is None:
+            return {"error": "Database not connected"}
+        if storage.name != "local":
+            return {"error": "Layout migration only applies to the local storage backend"}
+        
+        moved_images = await asyncio.to_thread(migrate_images_layout, dry_run)
+        migrated_uploads, unreferenced_uploads = await asyncio.to_thread(migrate_uploads_layout, dry_run)
+        
+        logger.info(f"Storage layout migration (dry_run={dry_run}): {len(moved_images)} images, {len(migrated_uploads)} uploads")
+        
+        return {
+            "success": True,
+            "dry_run": dry_run,
+            "images_moved": len(moved_images),
+            "uploads_migrated": len(migrated_uploads),
+            "unreferenced_uploads": unreferenced_uploads,
+            "images": moved_images,
+            "uploads": migrated_uploads
+        }
+        
+    except Exception as e:
+        return {"error": str(e)}
+
+# ============================================================================
+# SUBMISSION STATS ROLLUP
+# ============================================================================
+
+def rollup_day_key(moment):
+    """Rollup document _id for the UTC day of a datetime"""
+    return moment.strftime("%Y-%m-%d")
+
+def is_valid_status_name(status):
+    """Statuses become rollup field names, so they cannot contain '.' or '$'"""
+    return isinstance(status, str) and re.fullmatch(STATUS_NAME_PATTERN, status) is not None
+
+def rollup_status_key(status):
+    """Rollup field name for a status; missing and legacy unusable names count as "unknown" """
+    return status if is_valid_status_name(status) else "unknown"
+
+def update_submission_rollup(changes):
+    """Apply (submitted_at, total delta, {status: delta}) changes to the daily rollup.
+
+    Changes are folded per day into one $inc each. A failure is logged
+    rather than raised: the write it follows has already succeeded, and
+    POST /api/debug/stats/rebuild-rollup repairs any drift.
+    """
+    if submission_rollup_collection is None or not changes:
+        return
+    increments = {}
+    for submitted_at, total_delta, status_deltas in changes:
+        day_increments = increments.setdefault(rollup_day_key(submitted_at), {"total": 0})
+        day_increments["total"] += total_delta
+        for status, delta in status_deltas.items():
+            field = f"statuses.{rollup_status_key(status)}"
+            day_increments[field] = day_increments.get(field, 0) + delta
+    operations = [
+        pymongo.UpdateOne(
+            {"_id": day},
+            {"$inc": day_increments, "$setOnInsert": {"day": datetime.strptime(day, "%Y-%m-%d")}},
+            upsert=True
+        )
+        for day, day_increments in increments.items()
+    ]
+    try:
+        submission_rollup_collection.bulk_write(operations, ordered=False)
+    except PyMongoError as e:
+        logger.warning(f"⚠️ Failed to update submission rollup: {e}")
+
+def rebuild_submission_rollup():
+    """Recompute the daily rollup from every hot and archived submission in one aggregation"""
+    started = time.monotonic()
+    pipeline = submission_tiers_pipeline({}, True) + [
+        {"$group": {
+            "_id": {
+                "day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$submitted_at"}},
+                "status": {"$cond": [
+                    {"$regexMatch": {"input": {"$ifNull": ["$status", ""]}, "regex": STATUS_NAME_PATTERN}},
+                    "$status",
+                    "unknown"
+                ]}
+            },
+            "count": {"$sum": 1}
+        }},
+        {"$group": {
+            "_id": "$_id.day",
+            "total": {"$sum": "$count"},
+            "statuses": {"$push": {"k": "$_id.status", "v": "$count"}}
+        }},
+        {"$project": {
+            "day": {"$dateFromString": {"dateString": "$_id", "format": "%Y-%m-%d"}},
+            "total": 1,
+            "statuses": {"$arrayToObject": "$statuses"}
+        }},
+        {"$out": SUBMISSION_ROLLUP_COLLECTION_NAME}
+    ]
+    collection.aggregate(pipeline)
+    days = submission_rollup_collection.estimated_document_count()
+    logger.info(f"📈 Rebuilt submission rollup: {days} days in {time.monotonic() - started:.2f}s")
+    return {"days": days, "duration_seconds": round(time.monotonic() - started, 2)}
+
+def timeseries_bucket_start(day, granularity):
+    """First day of the day/week (Monday)/month bucket containing day"""
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+def next_timeseries_bucket(bucket, granularity):
+    """Start of the bucket after bucket"""
+    if granularity == "week":
+        return bucket + timedelta(days=7)
+    if granularity == "month":
+        return (bucket + timedelta(days=32)).replace(day=1)
+    return bucket + timedelta(days=1)
+
+@app.get("/api/stats/timeseries")
+async def get_submission_timeseries(
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    granularity: str = "day",
+    status: Optional[str] = None
+):
+    """Submission counts per day, week or month between date_from and date_to (inclusive).
+
+    Reads one rollup document per day in the range, so the cost does not
+    depend on how many submissions there are. Defaults to the last 30 days;
+    empty buckets are returned with a count of 0.
+    """
+    try:
+        if not is_db_connected or submission_rollup_collection is None:
             raise HTTPException(
                 status_code=503,
                 detail="Database connection not available"
             )
+        if granularity not in ("day", "week", "month"):
+            raise HTTPException(
+                status_code=400,
+                detail="granularity must be one of: day, week, month"
+            )
         
-        # Get total submissions
-        total_submissions = collection.count_documents({})
+        try:
+            today = datetime.strptime(rollup_day_key(datetime.utcnow()), "%Y-%m-%d")
+            end = datetime.strptime(date_to[:10], "%Y-%m-%d") if date_to else today
+            start = datetime.strptime(date_from[:10], "%Y-%m-%d") if date_from else end - timedelta(days=29)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="date_from and date_to must be dates (YYYY-MM-DD)"
+            )
+        if start > end:
+            raise HTTPException(
+                status_code=400,
+                detail="date_from must not be after date_to"
+            )
+        if (end - start).days >= STATS_TIMESERIES_MAX_DAYS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Date range is limited to {STATS_TIMESERIES_MAX_DAYS} days"
+            )
         
-        # Get submissions by status
-        pipeline = [
-            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}}
+        rollups = submission_rollup_collection.find(
+            {"_id": {"$gte": rollup_day_key(start), "$lte": rollup_day_key(end)}}
+        )
+        buckets = OrderedDict()
+        bucket = timeseries_bucket_start(start, granularity)
+        while bucket <= end:
+            buckets[bucket] = {"count": 0, "statuses": {}}
+            bucket = next_timeseries_bucket(bucket, granularity)
+        for rollup in rollups:
+            entry = buckets[timeseries_bucket_start(datetime.strptime(rollup["_id"], "%Y-%m-%d"), granularity)]
+            statuses = rollup.get("statuses", {})
+            entry["count"] += statuses.get(status, 0) if status else rollup.get("total", 0)
+            for name, count in statuses.items():
+                entry["statuses"][name] = entry["statuses"].get(name, 0) + count
+        
+        series = [
+            {
+                "bucket": bucket_start.strftime("%Y-%m-%d"),
+                "count": entry["count"],
+                "statuses": {name: count for name, count in entry["statuses"].items() if count}
+            }
+            for bucket_start, entry in buckets.items()
         ]
-        status_stats = list(collection.aggregate(pipeline))
+        return {
+            "success": True,
+            "granularity": granularity,
+            "date_from": rollup_day_key(start),
+            "date_to": rollup_day_key(end),
+            "status": status,
+            "total": sum(point["count"] for point in series),
+            "series": series
+        }
         
-        # Get submissions by date (last 30 days)
-        from datetime import timedelta
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        recent_submissions = collection.count_documents({
-            "submitted_at": {"$gte": thirty_days_ago}
-        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting submission time-series: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred while retrieving statistics"
+        )
+
+def submission_stats_summary():
+    """Total, last-30-days and per-status submission counts.
+
+    These cover the hot collection only; archived submissions are reported
+    as a separate estimated count (the timeseries rollup covers both).
+    """
+    # Get total submissions
+    total_submissions = collection.count_documents({})
+    
+    # Get submissions by status
+    pipeline = [
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1}}
+    ]
+    status_stats = list(collection.aggregate(pipeline))
+    
+    # Get submissions by date (last 30 days)
+    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+    recent_submissions = collection.count_documents({
+        "submitted_at": {"$gte": thirty_days_ago}
+    })
+    
+    return {
+        "total_submissions": total_submissions,
+        "recent_submissions_30_days": recent_submissions,
+        "status_breakdown": status_stats,
+        "archived_submissions": archive_collection.estimated_document_count() if archive_collection is not None else 0
+    }
+
+@app.get("/api/stats")
+async def get_submission_stats():
+    """Get statistics about form submissions"""
+    try:
+        if not is_db_connected or collection is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Database connection not available"
+            )
         
         return {
             "success": True,
-            "stats": {
-                "total_submissions": total_submissions,
-                "recent_submissions_30_days": recent_submissions,
-                "status_breakdown": status_stats
-            }
+            "stats": submission_stats_summary()
         }
         
     except HTTPException:
@@ -2410,37 +6659,12 @@ async def fix_images_now():
         if not is_db_connected or gallery_collection is None:
             return {"error": "Database not connected"}
         
-        fixed_count = 0
-        
-        # Get all gallery images and fix missing ones
-        cursor = gallery_collection.find({})
-        
-        for doc in cursor:
-            current_url = doc.get("current_url", "")
-            default_url = doc.get("default_url", "")
-            
-            # Check if current_url points to a local file that doesn't exist
-            if current_url.startswith("/images/"):
-                filename = current_url.replace("/images/", "")
-                file_path = IMAGES_DIR / filename
-                
-                if not file_path.exists():
-                    # Reset to default URL
-                    gallery_collection.update_one(
-                        {"_id": doc["_id"]},
-                        {
-                            "$set": {
-                                "current_url": default_url,
-                                "updated_at": datetime.utcnow()
-                            }
-                        }
-                    )
-                    fixed_count += 1
+        result = await asyncio.to_thread(run_gallery_maintenance)
         
         return {
             "success": True,
-            "fixed_count": fixed_count,
-            "message": f"Fixed {fixed_count} missing images"
+            "fixed_count": result["fixed_count"],
+            "message": f"Fixed {result['fixed_count']} missing images"
         }
         
     except Exception as e: